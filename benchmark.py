@@ -0,0 +1,317 @@
+"""
+Load-test and benchmark harness for login_server.py.
+
+Builds a synthetic data set (users.txt, movies.json, genres.json) in a temporary
+directory, starts the server in its own process on a free port and drives
+scripted scenarios against it. Results are printed, saved as JSON and compared
+to a stored baseline; the script exits with status 1 when a scenario regressed.
+
+    python benchmark.py --scale 10000
+    python benchmark.py --scale 10000 --save-baseline
+    python benchmark.py --scale 10000 --workers 4
+"""
+import argparse
+import hashlib
+import http.client
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_FILES = ["index.html", "login.html", "signup.html", "admin.html", "profile.html",
+                "style.css", "login.css", "admin.css", "script.js"]
+BENCH_PASSWORD = "password"
+ADMIN_USERNAME = "bench_admin"
+SCENARIOS = ["static", "browse", "login", "user_search", "genre_delete", "avatar_upload"]
+
+# A 1x1 transparent PNG, used as the uploaded avatar
+TINY_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000100e221bc330000000049454e44ae426082"
+)
+
+# --- Synthetic Data ---
+
+def build_dataset(workdir, scale, genre_count):
+    """Write synthetic data files and copy the static assets into workdir."""
+    password_hash = hashlib.sha256(BENCH_PASSWORD.encode()).hexdigest()
+    with open(os.path.join(workdir, "users.txt"), "w", encoding="utf-8") as f:
+        f.write(f"{ADMIN_USERNAME},{password_hash},admin,active,admin@example.com,\n")
+        for i in range(scale):
+            status = "suspended" if i % 50 == 49 else "active"
+            f.write(f"user{i},{password_hash},user,{status},user{i}@example.com,555-{i:07d}\n")
+
+    genre_ids = [str(uuid.UUID(int=i + 1)) for i in range(genre_count)]
+    genres = {genre_id: {"id": genre_id, "name": f"Genre {i}"} for i, genre_id in enumerate(genre_ids)}
+    movies = {}
+    for i in range(scale):
+        movie_id = str(uuid.UUID(int=(1 << 64) + i))
+        movies[movie_id] = {
+            "id": movie_id,
+            "title": f"Movie {i}",
+            "overview": f"Synthetic overview for movie {i}.",
+            "release_date": f"{1970 + i % 60}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            "genre_ids": [genre_ids[i % genre_count], genre_ids[(i * 7) % genre_count]],
+            "poster_path": f"/poster{i}.jpg",
+            "is_featured": i % 20 == 0,
+        }
+    with open(os.path.join(workdir, "movies.json"), "w", encoding="utf-8") as f:
+        json.dump(movies, f)
+    with open(os.path.join(workdir, "genres.json"), "w", encoding="utf-8") as f:
+        json.dump(genres, f)
+    with open(os.path.join(workdir, "people.json"), "w", encoding="utf-8") as f:
+        json.dump({}, f)
+    with open(os.path.join(workdir, "settings.json"), "w", encoding="utf-8") as f:
+        json.dump({"TMDB_API_KEY": "", "ALLOW_SIGNUP": True,
+                   "SITE_ANNOUNCEMENT": "", "ANNOUNCEMENT_ACTIVE": False}, f)
+
+    for name in STATIC_FILES:
+        source = os.path.join(REPO_DIR, name)
+        if os.path.exists(source):
+            shutil.copy(source, workdir)
+    return genre_ids
+
+# --- Server Control ---
+
+def free_port():
+    """Ask the OS for a port nobody is listening on."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(workdir, workers, startup_timeout):
+    """
+    Run login_server.py in workdir as a separate process, so the server does not
+    share an interpreter (and its GIL) with the load generator. Returns
+    (process, port) once the server answers requests with its data loaded.
+    """
+    port = free_port()
+    command = [sys.executable, os.path.join(REPO_DIR, "login_server.py"), "--port", str(port),
+               "--workers", str(workers),
+               "--no-rate-limits"]  # Measure the server itself; a login storm from one IP would be throttled
+    # Per-request logging to stderr would dominate the measurements
+    process = subprocess.Popen(command, cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + startup_timeout
+    while True:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited during startup with status {process.returncode}")
+        try:
+            status, _, _ = request(port, "GET", "/api/genres")
+            if status == 200:
+                for path in ("/api/movies", "/api/settings"):  # A single process loads each collection on first use
+                    request(port, "GET", path)
+                return process, port
+        except OSError:
+            pass
+        if time.monotonic() > deadline:
+            stop_server(process)
+            raise RuntimeError(f"Server did not start within {startup_timeout} seconds")
+        time.sleep(0.1)
+
+def stop_server(process):
+    """Stop the server process (and, in pre-fork mode, its workers)."""
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+def request(port, method, path, body=None, headers=None):
+    """Send one request on a fresh connection and return (status, headers, body)."""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    try:
+        conn.request(method, path, body=body, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, response.getheaders(), response.read()
+    finally:
+        conn.close()
+
+def login(port, username):
+    """Log in and return a Cookie header value for the new session."""
+    body = urlencode({"username": username, "password": BENCH_PASSWORD})
+    status, headers, _ = request(port, "POST", "/login", body,
+                                 {"Content-Type": "application/x-www-form-urlencoded"})
+    if status != 302:
+        raise RuntimeError(f"Login as {username} failed with status {status}")
+    for name, value in headers:
+        if name.lower() == "set-cookie" and value.startswith("session_id="):
+            return value.split(";", 1)[0]
+    raise RuntimeError("Login response did not set a session cookie")
+
+# --- Scenarios ---
+# Each scenario builder returns a function mapping a request number to
+# (method, path, body, headers, expected_status).
+
+def build_scenario(name, port, scale, genre_ids):
+    form_headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    if name == "static":
+        paths = ["/", "/style.css", "/script.js", "/login"]
+        return lambda i: ("GET", paths[i % len(paths)], None, {}, 200)
+    if name == "browse":
+        paths = ["/api/movies", "/api/genres", "/api/settings"]
+        return lambda i: ("GET", paths[i % len(paths)], None, {}, 200)
+    if name == "login":
+        return lambda i: ("POST", "/login",
+                          urlencode({"username": f"user{(i * 7919) % scale}", "password": BENCH_PASSWORD}),
+                          form_headers, 403 if (i * 7919) % scale % 50 == 49 else 302)
+    if name == "user_search":
+        cookie = {"Cookie": login(port, ADMIN_USERNAME)}
+        return lambda i: ("GET", f"/admin/users?search=user{i % 1000}", None, cookie, 200)
+    if name == "genre_delete":
+        headers = dict(form_headers, Cookie=login(port, ADMIN_USERNAME))
+        return lambda i: ("POST", "/admin/genres/delete", urlencode({"id": genre_ids[i]}), headers, 200)
+    if name == "avatar_upload":
+        cookie = login(port, "user0")
+        boundary = uuid.uuid4().hex
+        body = (f"--{boundary}\r\n"
+                'Content-Disposition: form-data; name="avatar"; filename="avatar.png"\r\n'
+                "Content-Type: image/png\r\n\r\n").encode() + TINY_PNG + f"\r\n--{boundary}--\r\n".encode()
+        headers = {"Cookie": cookie, "Content-Type": f"multipart/form-data; boundary={boundary}"}
+        return lambda i: ("POST", "/api/user/avatar/upload", body, headers, 200)
+    raise ValueError(f"Unknown scenario: {name}")
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+def run_scenario(name, port, scale, genre_ids, total_requests, concurrency):
+    """Drive one scenario and return its throughput and latency summary."""
+    make_request = build_scenario(name, port, scale, genre_ids)
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def worker(i):
+        nonlocal errors
+        method, path, body, headers, expected = make_request(i)
+        start = time.perf_counter()
+        try:
+            status, _, _ = request(port, method, path, body, headers)
+        except OSError:
+            status = None
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            if status != expected:
+                errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(total_requests)))
+    duration = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total_requests,
+        "errors": errors,
+        "duration_s": round(duration, 4),
+        "throughput_rps": round(total_requests / duration, 2) if duration else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+# --- Baseline Comparison ---
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Return a list of human-readable regressions against the baseline."""
+    regressions = []
+    if baseline.get("scale") != results["scale"]:
+        print(f"Warning: baseline was recorded at scale {baseline.get('scale')}, not {results['scale']}; skipping comparison.")
+        return regressions
+    if baseline.get("workers", 1) != results["workers"]:
+        print(f"Warning: baseline was recorded with {baseline.get('workers', 1)} workers, not {results['workers']}; skipping comparison.")
+        return regressions
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{name}: errors {previous['errors']} -> {current['errors']}")
+        if previous["throughput_rps"] and current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {previous['throughput_rps']} -> {current['throughput_rps']} req/s")
+        if previous["p95_ms"] and current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']} -> {current['p95_ms']} ms")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark login_server.py with synthetic data.")
+    parser.add_argument("--scale", type=int, default=1000, help="Number of synthetic users and movies (1k-1M)")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent client connections")
+    parser.add_argument("--workers", type=int, default=1, help="Server worker processes (see login_server.py --workers)")
+    parser.add_argument("--startup-timeout", type=float, default=300, help="Seconds to wait for the server to load its data")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios to run")
+    parser.add_argument("--output", default="bench_results.json", help="Where to write the results JSON")
+    parser.add_argument("--baseline", default="bench_baseline.json", help="Baseline results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed fractional slowdown before failing")
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    output_path = os.path.abspath(args.output)
+    baseline_path = os.path.abspath(args.baseline)
+    workdir = tempfile.mkdtemp(prefix="login_server_bench_")
+    try:
+        print(f"Building synthetic data set (scale={args.scale}) in {workdir}")
+        genre_ids = build_dataset(workdir, args.scale, max(args.requests, 20))
+        process, port = start_server(workdir, args.workers, args.startup_timeout)
+
+        results = {
+            "scale": args.scale,
+            "requests_per_scenario": args.requests,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "scenarios": {},
+        }
+        try:
+            for name in scenarios:
+                summary = run_scenario(name, port, args.scale, genre_ids, args.requests, args.concurrency)
+                results["scenarios"][name] = summary
+                print(f"{name:>14}: {summary['throughput_rps']:>9} req/s  p50 {summary['p50_ms']:>8} ms  "
+                      f"p95 {summary['p95_ms']:>8} ms  p99 {summary['p99_ms']:>8} ms  errors {summary['errors']}")
+        finally:
+            stop_server(process)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4)
+    print(f"Results written to {output_path}")
+
+    if args.save_baseline:
+        shutil.copy(output_path, baseline_path)
+        print(f"Baseline saved to {baseline_path}")
+        return 0
+    if not os.path.exists(baseline_path):
+        print("No baseline found; run with --save-baseline to record one.")
+        return 0
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print("PERFORMANCE REGRESSION DETECTED:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    print("No regressions against baseline.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
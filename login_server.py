@@ -3,11 +3,30 @@ import os
 import hashlib
 import json
 import uuid
-from http.server import BaseHTTPRequestHandler, HTTPServer
+import socket
+import signal
+import bisect
+import functools
+import threading
+import time
+import sys
+import gc
+import random
+import marshal
+import mmap
+import struct
+import cProfile
+import pstats
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from urllib.parse import parse_qs, urlparse
 from email.parser import BytesParser
 from email.policy import default
 import io
+import csv
+import datetime
+import math
+from collections import Counter, OrderedDict
 
 # --- File Paths for Content Data ---
 USER_FILE = "users.txt"
@@ -16,14 +35,923 @@ GENRE_FILE = "genres.json"
 PEOPLE_FILE = "people.json"  # Reserved for future use
 SETTINGS_FILE = "settings.json"
 AVATAR_DIR = "user_avatars"
+SNAPSHOT_SUFFIX = ".snapshot"  # Binary copy of a data file, loaded instead of it while fresh
+SNAPSHOT_FORMAT = (1, sys.version_info[:2])  # marshal's format can change between Python versions
+SESSION_FILE = "sessions.txt"  # Append-only session journal shared by all worker processes
+SESSION_LOCK_FILE = ".sessions.lock"  # Keeps the session journal from being compacted mid-append
+LOCK_FILE = ".server.lock"  # Serializes writes between worker processes
+RATE_LIMIT_LOCK_FILE = ".ratelimit.lock"  # Serializes updates to the rate-limit buckets shared by workers
 DEFAULT_AVATARS = ["avatar1.png", "avatar2.png", "avatar3.png"]  # You'll need to provide these images
 
+# --- Bulk Catalog Operations ---
+BULK_IMPORT_PATHS = ("/admin/movies/bulk_import", "/admin/genres/bulk_import")
+BULK_MAX_REPORTED_ERRORS = 1000  # Per-row errors listed in a bulk response (all are counted)
+EXPORT_BATCH_SIZE = 1000  # Records per write when streaming an export
+
+# --- Release Calendar ---
+UPCOMING_DEFAULT_LIMIT = 20  # Movies returned by /api/movies/upcoming without ?limit=
+
+# --- Metrics ---
+# Counters, gauges and latency histograms for requests, persistence calls and
+# caches. Each worker process keeps its own numbers and, in pre-fork mode, saves
+# them to METRICS_DIR every METRICS_FLUSH_INTERVAL seconds; /admin/metrics merges
+# every worker's numbers, so a scrape covers the whole server.
+
+METRICS_DIR = "metrics"  # Per-worker metrics in pre-fork mode: <pid>.json
+METRICS_FLUSH_INTERVAL = 5.0  # Seconds between a worker saving its metrics
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATIC_EXTENSIONS = (".css", ".js", ".png", ".jpg", ".jpeg", ".gif", ".ico")
+
+# Routes reported under their own label, by method. Any other path is reported as
+# "unmatched" (or "static"), so clients cannot create new metric series at will.
+METRIC_ROUTES = {
+    "GET": frozenset({
+        "/", "/index.html", "/login", "/signup", "/admin", "/profile", "/movie.html", "/person.html",
+        "/browser", "/watchlist.html",
+        "/api/movies", "/api/movies/upcoming", "/api/movies/years", "/api/genres", "/api/settings",
+        "/api/user/avatar",
+        "/admin/users", "/admin/movies", "/admin/movies/export", "/admin/genres", "/admin/genres/export",
+        "/admin/metrics", "/admin/profiling", "/admin/profiling/download",
+        "/admin/analytics/users_by_creation_month", "/admin/analytics/movies_by_genre",
+        "/admin/analytics/top_movies_by_feature", "/admin/analytics/active_vs_suspended_users",
+    }),
+    "POST": frozenset({
+        "/login", "/signup", "/logout", "/api/user/avatar/upload",
+        "/admin/movies/add", "/admin/movies/edit", "/admin/movies/delete",
+        "/admin/movies/bulk_import", "/admin/movies/bulk_delete", "/admin/movies/bulk_feature",
+        "/admin/genres/add", "/admin/genres/edit", "/admin/genres/delete", "/admin/genres/bulk_import",
+        "/admin/users/toggle_admin", "/admin/users/toggle_suspension", "/admin/users/reset_password",
+        "/admin/settings/update", "/admin/profiling/start", "/admin/profiling/stop",
+    }),
+}
+
+def new_histogram():
+    return {"count": 0, "sum": 0.0, "buckets": [0] * (len(LATENCY_BUCKETS) + 1)}
+
+def observe_histogram(histogram, seconds):
+    histogram["count"] += 1
+    histogram["sum"] += seconds
+    histogram["buckets"][bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+def merge_histogram(histogram, other):
+    histogram["count"] += other["count"]
+    histogram["sum"] += other["sum"]
+    histogram["buckets"] = [a + b for a, b in zip(histogram["buckets"], other["buckets"])]
+
+def cumulative_buckets(histogram):
+    """Return [(upper_bound_label, cumulative_count)] in Prometheus order."""
+    result, total = [], 0
+    for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), histogram["buckets"]):
+        total += count
+        result.append(("+Inf" if bound == float("inf") else repr(bound), total))
+    return result
+
+def prometheus_labels(**labels):
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels.items()) + "}"
+
+class Metrics:
+    """Thread-safe request, persistence and cache metrics for this process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.is_merged = False  # True for metrics added up from several workers
+        self.workers = []  # PIDs of the workers merged into these metrics
+        self.started = time.time()
+        self.in_flight = 0
+        self.routes = {}  # {(method, route): {"status": {code: n}, "bytes_in", "bytes_out", "latency"}}
+        self.persistence = {}  # {(operation, file): histogram}
+        self.caches = {}  # {cache_name: {"hits": n, "misses": n}}
+        self.events = {}  # {event_name: n}, e.g. rejected requests
+
+    def request_started(self):
+        with self.lock:
+            self.in_flight += 1
+
+    def request_finished(self, method, route, status, seconds, bytes_in, bytes_out):
+        with self.lock:
+            self.in_flight -= 1
+            entry = self.routes.get((method, route))
+            if entry is None:
+                entry = self.routes[(method, route)] = {
+                    "status": {}, "bytes_in": 0, "bytes_out": 0, "latency": new_histogram()}
+            entry["status"][status] = entry["status"].get(status, 0) + 1
+            entry["bytes_in"] += bytes_in
+            entry["bytes_out"] += bytes_out
+            observe_histogram(entry["latency"], seconds)
+
+    def observe_persistence(self, operation, filepath, seconds):
+        with self.lock:
+            histogram = self.persistence.get((operation, filepath))
+            if histogram is None:
+                histogram = self.persistence[(operation, filepath)] = new_histogram()
+            observe_histogram(histogram, seconds)
+
+    def cache_lookup(self, cache_name, hit):
+        with self.lock:
+            counts = self.caches.setdefault(cache_name, {"hits": 0, "misses": 0})
+            counts["hits" if hit else "misses"] += 1
+
+    def increment(self, event_name):
+        with self.lock:
+            self.events[event_name] = self.events.get(event_name, 0) + 1
+
+    def dump(self):
+        """This process's raw numbers as JSON, for merged() in another worker."""
+        with self.lock:
+            return json.dumps({
+                "pid": os.getpid(),
+                "started": self.started,
+                "in_flight": self.in_flight,
+                "routes": [[method, route, entry] for (method, route), entry in self.routes.items()],
+                "persistence": [[operation, filepath, histogram]
+                                for (operation, filepath), histogram in self.persistence.items()],
+                "caches": self.caches,
+                "events": self.events,
+            })
+
+    @classmethod
+    def merged(cls, dumps):
+        """Metrics adding up the numbers in several workers' dump() output."""
+        merged = cls()
+        merged.is_merged = True
+        for data in map(json.loads, dumps):
+            merged.workers.append(data["pid"])
+            merged.started = min(merged.started, data["started"])
+            merged.in_flight += data["in_flight"]
+            for method, route, entry in data["routes"]:
+                target = merged.routes.setdefault((method, route), {
+                    "status": {}, "bytes_in": 0, "bytes_out": 0, "latency": new_histogram()})
+                for code, n in entry["status"].items():
+                    target["status"][int(code)] = target["status"].get(int(code), 0) + n
+                target["bytes_in"] += entry["bytes_in"]
+                target["bytes_out"] += entry["bytes_out"]
+                merge_histogram(target["latency"], entry["latency"])
+            for operation, filepath, histogram in data["persistence"]:
+                merge_histogram(merged.persistence.setdefault((operation, filepath), new_histogram()), histogram)
+            for name, counts in data["caches"].items():
+                target = merged.caches.setdefault(name, {"hits": 0, "misses": 0})
+                target["hits"] += counts["hits"]
+                target["misses"] += counts["misses"]
+            for name, n in data["events"].items():
+                merged.events[name] = merged.events.get(name, 0) + n
+        merged.workers.sort()
+        return merged
+
+    def to_dict(self):
+        """Metrics as a JSON-serializable dictionary."""
+        with self.lock:
+            routes = [{
+                "method": method,
+                "route": route,
+                "count": entry["latency"]["count"],
+                "status_codes": {str(code): n for code, n in sorted(entry["status"].items())},
+                "bytes_in": entry["bytes_in"],
+                "bytes_out": entry["bytes_out"],
+                "latency_seconds": {"sum": entry["latency"]["sum"],
+                                    "buckets": dict(cumulative_buckets(entry["latency"]))},
+            } for (method, route), entry in sorted(self.routes.items())]
+            persistence = [{
+                "operation": operation,
+                "file": filepath,
+                "count": histogram["count"],
+                "seconds": {"sum": histogram["sum"], "buckets": dict(cumulative_buckets(histogram))},
+            } for (operation, filepath), histogram in sorted(self.persistence.items())]
+            caches = {name: dict(counts, hit_ratio=counts["hits"] / max(1, counts["hits"] + counts["misses"]))
+                      for name, counts in self.caches.items()}
+            return {
+                "pid": None if self.is_merged else os.getpid(),
+                "workers": self.workers,
+                "uptime_seconds": time.time() - self.started,
+                "in_flight": self.in_flight,
+                "routes": routes,
+                "persistence": persistence,
+                "caches": caches,
+                "events": dict(self.events),
+            }
+
+    def to_prometheus(self):
+        """Metrics in the Prometheus text exposition format."""
+        data = self.to_dict()
+        worker = {"pid": data["pid"]} if data["pid"] is not None else {}  # Merged metrics cover every worker
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being handled.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight{prometheus_labels(**worker)} {data['in_flight']}",
+            "# HELP http_requests_total Requests handled, by route and status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        for route in data["routes"]:
+            for status, n in route["status_codes"].items():
+                labels = prometheus_labels(**worker, method=route["method"], route=route["route"], status=status)
+                lines.append(f"http_requests_total{labels} {n}")
+        lines += ["# HELP http_request_bytes_total Request body bytes received (in) and response bytes sent (out).",
+                  "# TYPE http_request_bytes_total counter"]
+        for route in data["routes"]:
+            for direction in ("in", "out"):
+                labels = prometheus_labels(**worker, method=route["method"], route=route["route"], direction=direction)
+                lines.append(f"http_request_bytes_total{labels} {route['bytes_' + direction]}")
+        lines += ["# HELP http_request_duration_seconds Request latency.",
+                  "# TYPE http_request_duration_seconds histogram"]
+        for route in data["routes"]:
+            base = dict(worker, method=route["method"], route=route["route"])
+            for bound, n in route["latency_seconds"]["buckets"].items():
+                lines.append(f"http_request_duration_seconds_bucket{prometheus_labels(**base, le=bound)} {n}")
+            lines.append(f"http_request_duration_seconds_sum{prometheus_labels(**base)} {route['latency_seconds']['sum']}")
+            lines.append(f"http_request_duration_seconds_count{prometheus_labels(**base)} {route['count']}")
+        lines += ["# HELP persistence_duration_seconds Time spent loading and saving data files.",
+                  "# TYPE persistence_duration_seconds histogram"]
+        for entry in data["persistence"]:
+            base = dict(worker, operation=entry["operation"], file=entry["file"])
+            for bound, n in entry["seconds"]["buckets"].items():
+                lines.append(f"persistence_duration_seconds_bucket{prometheus_labels(**base, le=bound)} {n}")
+            lines.append(f"persistence_duration_seconds_sum{prometheus_labels(**base)} {entry['seconds']['sum']}")
+            lines.append(f"persistence_duration_seconds_count{prometheus_labels(**base)} {entry['count']}")
+        lines += ["# HELP cache_lookups_total Cache lookups, by result.",
+                  "# TYPE cache_lookups_total counter"]
+        for name, counts in sorted(data["caches"].items()):
+            for result in ("hits", "misses"):
+                lines.append(f"cache_lookups_total{prometheus_labels(**worker, cache=name, result=result)} {counts[result]}")
+        lines += ["# HELP events_total Notable server events, such as rejected requests.",
+                  "# TYPE events_total counter"]
+        for name, n in sorted(data["events"].items()):
+            lines.append(f"events_total{prometheus_labels(**worker, event=name)} {n}")
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
+
+def save_worker_metrics():
+    """Save this worker's metrics where merged_metrics() in any worker can read them."""
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    try:
+        with atomic_write(os.path.join(METRICS_DIR, f"{os.getpid()}.json")) as f:
+            f.write(metrics.dump())
+    except OSError as e:
+        print(f"Warning: could not save metrics: {e}")
+
+def flush_worker_metrics():
+    """Background loop saving this worker's metrics."""
+    while True:
+        time.sleep(METRICS_FLUSH_INTERVAL)
+        save_worker_metrics()
+
+def merged_metrics():
+    """The metrics /admin/metrics reports: this process's, or in pre-fork mode every worker's added up."""
+    if not _prefork:
+        return metrics
+    save_worker_metrics()  # Our own numbers are reported up to date
+    dumps = []
+    for filename in sorted(os.listdir(METRICS_DIR)):
+        if filename.endswith(".json"):
+            try:
+                with open(os.path.join(METRICS_DIR, filename), "r", encoding="utf-8") as f:
+                    dumps.append(f.read())
+            except OSError:
+                continue
+    return Metrics.merged(dumps)
+
+def timed_persistence(default_file=None):
+    """Decorator recording how long a load/save call takes, labelled by data file."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                filepath = next((arg for arg in args if isinstance(arg, str)), default_file)
+                metrics.observe_persistence(func.__name__, filepath, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def route_label(method, path, status):
+    """Collapse a request path into a bounded set of metric labels."""
+    if path in METRIC_ROUTES.get(method, ()):
+        return path
+    if method == "GET" and path.endswith(STATIC_EXTENSIONS) and status != 404:
+        return "static"
+    return "unmatched"
+
+class CountingWriter:
+    """Wraps the response stream to count bytes written."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.bytes_written = 0
+
+    def write(self, data):
+        self.bytes_written += len(data)
+        return self.stream.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+def instrumented(handler_method):
+    """Decorator recording metrics for a do_GET/do_POST style method."""
+    @functools.wraps(handler_method)
+    def wrapper(self):
+        start = time.perf_counter()
+        self.response_status = None
+        metrics.request_started()
+        try:
+            return handler_method(self)
+        finally:
+            try:
+                bytes_in = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                bytes_in = 0
+            status = self.response_status or 500
+            metrics.request_finished(self.command, route_label(self.command, urlparse(self.path).path, status), status,
+                                     time.perf_counter() - start, bytes_in, self.wfile.bytes_written)
+    return wrapper
+
+# --- Profiling ---
+# An admin can switch on profiling for a bounded time window. Sampled requests run
+# under cProfile (for pstats output) while a background thread samples their
+# stacks (for collapsed-stack flamegraph output). Profiling switches itself off
+# when the window ends; results stay downloadable until the next run starts.
+# In pre-fork mode each worker profiles the requests it serves: start and stop
+# reach every worker through PROFILE_CONTROL_FILE, and each worker saves its
+# results under PROFILE_RESULTS_DIR, where they are merged for status and download.
+
+PROFILE_SAMPLE_INTERVAL = 0.005  # Seconds between stack samples
+PROFILE_MAX_DURATION = 600  # Longest allowed profiling window, in seconds
+PROFILE_MAX_STACKS = 10000  # Distinct collapsed stacks kept before folding into "[truncated]"
+PROFILE_CONTROL_FILE = "profiling.json"  # The current profiling run, read by every worker
+PROFILE_RESULTS_DIR = "profiles"  # Per-worker results: <run_id>-<pid>.json and .pstats
+PROFILE_FLUSH_INTERVAL = 1.0  # Seconds between a worker saving its results and checking for a stop
+
+class Profiler:
+    """Admin-controlled request profiler with cProfile and a stack sampler."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cprofile_lock = threading.Lock()  # cProfile can only profile one request at a time
+        self.run_id = None
+        self.active = False
+        self.sample_rate = 0.0
+        self.route = None
+        self.ends_at = 0.0
+        self.sampled_threads = set()  # Thread ids of requests currently being profiled
+        self.sampler = None  # The stack sampling thread, while one is running
+        self.stats = None  # Aggregated pstats.Stats
+        self.stacks = {}  # {collapsed stack: sample count}
+        self.profiled_requests = 0
+
+    def start(self, sample_rate, route, ends_at, run_id=None):
+        """Begin a new profiling window ending at time ends_at, discarding the previous results."""
+        with self.lock:
+            self.run_id = run_id or uuid.uuid4().hex
+            self.sample_rate = sample_rate
+            self.route = route
+            self.ends_at = ends_at
+            self.stats = None
+            self.stacks = {}
+            self.profiled_requests = 0
+            self.active = True
+            if self.sampler is None:  # Otherwise the running sampler carries on into the new window
+                self.sampler = threading.Thread(target=self.sample_stacks, daemon=True)
+                self.sampler.start()
+
+    def stop(self):
+        with self.lock:
+            self.active = False
+
+    def is_active(self):
+        if self.active and time.time() >= self.ends_at:
+            self.stop()
+        return self.active
+
+    def should_profile(self, path):
+        if not self.is_active():
+            return False
+        if self.route:
+            return path == self.route
+        return random.random() < self.sample_rate
+
+    @contextmanager
+    def profile_request(self, path):
+        """Profile the enclosed request if it is selected for sampling."""
+        if not self.should_profile(path):
+            yield
+            return
+        thread_id = threading.get_ident()
+        profile = cProfile.Profile() if self.cprofile_lock.acquire(blocking=False) else None
+        with self.lock:
+            self.sampled_threads.add(thread_id)
+        try:
+            if profile:
+                profile.enable()
+            yield
+        finally:
+            if profile:
+                profile.disable()
+                self.cprofile_lock.release()
+            with self.lock:
+                self.sampled_threads.discard(thread_id)
+                self.profiled_requests += 1
+                if profile:
+                    try:
+                        if self.stats is None:
+                            self.stats = pstats.Stats(profile)
+                        else:
+                            self.stats.add(profile)
+                    except TypeError:
+                        pass  # Nothing was recorded for this request
+
+    def keep_sampling(self):
+        """Whether the sampler should go on; if not, it gives up its place to the next start()."""
+        self.is_active()  # Switches profiling off once the window has ended
+        with self.lock:
+            if not self.active:
+                self.sampler = None
+            return self.active
+
+    def sample_stacks(self):
+        """Background loop recording the stacks of requests being profiled."""
+        next_flush = time.monotonic() + PROFILE_FLUSH_INTERVAL
+        while self.keep_sampling():
+            time.sleep(PROFILE_SAMPLE_INTERVAL)
+            if _prefork and time.monotonic() >= next_flush:
+                sync_profiling_control()  # Notices a stop even if this worker gets no requests
+                save_profile_results()
+                next_flush = time.monotonic() + PROFILE_FLUSH_INTERVAL
+            frames = sys._current_frames()
+            with self.lock:
+                for thread_id in self.sampled_threads:
+                    frame = frames.get(thread_id)
+                    if frame is None:
+                        continue
+                    stack = []
+                    while frame is not None:
+                        code = frame.f_code
+                        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                        frame = frame.f_back
+                    key = ";".join(reversed(stack))
+                    if key not in self.stacks and len(self.stacks) >= PROFILE_MAX_STACKS:
+                        key = "[truncated]"
+                    self.stacks[key] = self.stacks.get(key, 0) + 1
+        if _prefork:
+            save_profile_results()
+
+    def status(self):
+        active = self.is_active()
+        with self.lock:
+            return {
+                "pid": os.getpid(),
+                "active": active,
+                "sample_rate": self.sample_rate,
+                "route": self.route,
+                "seconds_remaining": max(0.0, self.ends_at - time.time()) if active else 0.0,
+                "profiled_requests": self.profiled_requests,
+                "stack_samples": sum(self.stacks.values()),
+                "has_pstats": self.stats is not None,
+            }
+
+    def collapsed_stacks(self):
+        """Results in collapsed-stack format, one "frame;frame;frame count" line per stack."""
+        with self.lock:
+            return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+    def pstats_dump(self):
+        """Results in the binary format written by pstats.Stats.dump_stats, or None."""
+        with self.lock:
+            return marshal.dumps(self.stats.stats) if self.stats is not None else None
+
+    def pstats_text(self, limit=50):
+        """Human-readable pstats report sorted by cumulative time."""
+        with self.lock:
+            if self.stats is None:
+                return "No profile data collected.\n"
+            stream = io.StringIO()
+            self.stats.stream = stream
+            self.stats.sort_stats("cumulative").print_stats(limit)
+            return stream.getvalue()
+
+profiler = Profiler()
+_profiling_control_lock = threading.Lock()
+
+def publish_profiling_control(sample_rate, route, ends_at, run_id, active=True):
+    """Record the current profiling run where every worker will pick it up."""
+    with atomic_write(PROFILE_CONTROL_FILE) as f:
+        json.dump({"run_id": run_id, "active": active, "sample_rate": sample_rate,
+                   "route": route, "ends_at": ends_at}, f)
+    os.makedirs(PROFILE_RESULTS_DIR, exist_ok=True)
+    for filename in os.listdir(PROFILE_RESULTS_DIR):
+        if not filename.startswith(run_id + "-"):
+            os.remove(os.path.join(PROFILE_RESULTS_DIR, filename))  # Results of an earlier run
+
+def read_profiling_control():
+    """Return the profiling run recorded in PROFILE_CONTROL_FILE, or None."""
+    try:
+        with open(PROFILE_CONTROL_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def sync_profiling_control():
+    """Start or stop this worker's profiler to match the run another worker published."""
+    with _profiling_control_lock:
+        if not file_changed(PROFILE_CONTROL_FILE):
+            return
+        remember_file_stamp(PROFILE_CONTROL_FILE)
+        control = read_profiling_control()
+    if control is None:
+        return
+    if control["active"] and control["run_id"] != profiler.run_id:
+        profiler.start(control["sample_rate"], control["route"], control["ends_at"], control["run_id"])
+    elif not control["active"] and control["run_id"] == profiler.run_id:
+        profiler.stop()
+
+def save_profile_results():
+    """Save this worker's results for the current run, for merged_profile_results()."""
+    if profiler.run_id is None:
+        return
+    path = os.path.join(PROFILE_RESULTS_DIR, f"{profiler.run_id}-{os.getpid()}")
+    with profiler.lock:
+        results = {"profiled_requests": profiler.profiled_requests, "stacks": dict(profiler.stacks)}
+    try:
+        with atomic_write(path + ".json") as f:
+            json.dump(results, f)
+        stats_dump = profiler.pstats_dump()
+        if stats_dump is not None:
+            with atomic_write(path + ".pstats", "wb") as f:
+                f.write(stats_dump)
+    except OSError as e:
+        print(f"Warning: could not save profile results: {e}")
+
+def merged_profile_results():
+    """
+    Combine every worker's saved results for the current run into one Profiler,
+    whose status and download methods then cover all workers.
+    """
+    merged = Profiler()
+    control = read_profiling_control()
+    if control is None:
+        return merged
+    merged.run_id = control["run_id"]
+    merged.sample_rate = control["sample_rate"]
+    merged.route = control["route"]
+    merged.ends_at = control["ends_at"]
+    merged.active = control["active"]
+    prefix = os.path.join(PROFILE_RESULTS_DIR, control["run_id"] + "-")
+    pstats_paths = []
+    for filename in sorted(os.listdir(PROFILE_RESULTS_DIR)):
+        path = os.path.join(PROFILE_RESULTS_DIR, filename)
+        if not path.startswith(prefix):
+            continue
+        if filename.endswith(".pstats"):
+            pstats_paths.append(path)
+        elif filename.endswith(".json"):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    results = json.load(f)
+            except (OSError, ValueError):
+                continue
+            merged.profiled_requests += results["profiled_requests"]
+            for stack, count in results["stacks"].items():
+                merged.stacks[stack] = merged.stacks.get(stack, 0) + count
+    if pstats_paths:
+        try:
+            merged.stats = pstats.Stats(*pstats_paths)
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+    return merged
+
+def profile_results():
+    """The profiler whose results an admin sees: this process's, or in pre-fork mode all workers' merged."""
+    return merged_profile_results() if _prefork else profiler
+
+def profiled(handler_method):
+    """Decorator running a do_GET/do_POST style method under the admin profiler."""
+    @functools.wraps(handler_method)
+    def wrapper(self):
+        with profiler.profile_request(urlparse(self.path).path):
+            return handler_method(self)
+    return wrapper
+
+# --- Rate Limiting and Admission Control ---
+# Every request spends a token from a bucket keyed by client IP and, when the
+# request carries a valid session, from a second bucket keyed by that session.
+# Budgets differ for auth, admin and public routes. In pre-fork mode the auth
+# buckets are shared by all workers, so a password-guessing client gets the same
+# budget however many workers there are; the others are kept per worker, where
+# they cost no cross-process locking. Separately, the server stops
+# admitting requests once MAX_IN_FLIGHT are in progress and answers the excess
+# with an immediate 503, so overload degrades into fast rejections instead of an
+# ever-growing queue. Only parsed requests count towards MAX_IN_FLIGHT, and a
+# connection that sends nothing for REQUEST_TIMEOUT seconds is dropped, so idle
+# connections can neither starve other clients nor pile up.
+
+RATE_LIMITS = {  # {category: {key kind: (tokens per second, burst size)}}
+    "auth": {"ip": (2.0, 20), "session": (1.0, 10)},
+    "admin": {"ip": (50.0, 200), "session": (20.0, 100)},
+    "public": {"ip": (100.0, 400), "session": (50.0, 200)},
+}
+RATE_LIMIT_MAX_CLIENTS = 100000  # Buckets kept in memory; the least recently used are dropped first
+SHARED_RATE_LIMIT_CATEGORIES = ("auth",)  # Enforced across all workers; other budgets apply per worker
+SHARED_RATE_LIMIT_SLOTS = 65536  # Buckets in the table shared by workers
+MAX_IN_FLIGHT = 64  # Concurrent requests per process before new ones are shed
+REQUEST_TIMEOUT = 10  # Seconds a connection may wait between reads before it is closed
+OVERLOAD_RETRY_AFTER = 1  # Seconds clients are asked to wait after a 503
+
+rate_limits_enabled = True  # Set to False (or run with --no-rate-limits) to disable per-client limits
+
+class TokenBucketLimiter:
+    """Token buckets for many clients, bounded to the most recently seen ones."""
+
+    def __init__(self, max_clients=RATE_LIMIT_MAX_CLIENTS):
+        self.lock = threading.Lock()
+        self.max_clients = max_clients
+        self.buckets = OrderedDict()  # {key: [tokens, last_refill_time]}, least recently used first
+
+    def acquire(self, key, rate, burst):
+        """Take one token; returns 0 if allowed, else the seconds until a token is available."""
+        now = time.monotonic()
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = [float(burst), now]
+                if len(self.buckets) > self.max_clients:
+                    self.buckets.popitem(last=False)  # A dropped bucket simply starts full again
+            else:
+                self.buckets.move_to_end(key)
+                bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return 0
+            return (1 - bucket[0]) / rate
+
+class SharedTokenBucketLimiter:
+    """
+    Token buckets in memory shared by forked worker processes, so that a budget
+    holds across all of them. Buckets live in a fixed table of slots, picked by a
+    hash of the key; a key whose slot another key has taken simply starts full.
+    """
+    SLOT = struct.Struct("=8sdd")  # Key digest, tokens, last refill time (monotonic, system-wide)
+
+    def __init__(self, slots=SHARED_RATE_LIMIT_SLOTS):
+        self.slots = slots
+        self.table = mmap.mmap(-1, slots * self.SLOT.size)  # Anonymous shared memory, inherited across fork()
+
+    def acquire(self, key, rate, burst):
+        """Take one token; returns 0 if allowed, else the seconds until a token is available."""
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=8).digest()
+        offset = int.from_bytes(digest, "little") % self.slots * self.SLOT.size
+        with file_lock(RATE_LIMIT_LOCK_FILE):
+            now = time.monotonic()
+            stored_digest, tokens, last_refill = self.SLOT.unpack_from(self.table, offset)
+            if stored_digest == digest:
+                tokens = min(burst, tokens + (now - last_refill) * rate)
+            else:
+                tokens = float(burst)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self.SLOT.pack_into(self.table, offset, digest, tokens, now)
+        return 0 if allowed else (1 - tokens) / rate
+
+rate_limiter = TokenBucketLimiter()
+shared_rate_limiter = None  # A SharedTokenBucketLimiter in pre-fork mode, created before the workers fork
+
+def rate_limit_category(path):
+    """Which budget a request path draws from."""
+    if path in ("/login", "/signup", "/logout"):
+        return "auth"
+    if path == "/admin" or path.startswith("/admin/"):
+        return "admin"
+    return "public"
+
+def rate_limited(handler_method):
+    """Decorator rejecting a do_GET/do_POST style call with 429 when the client is over budget."""
+    @functools.wraps(handler_method)
+    def wrapper(self):
+        if rate_limits_enabled:
+            category = rate_limit_category(urlparse(self.path).path)
+            budgets = RATE_LIMITS[category]
+            limiter = rate_limiter
+            if shared_rate_limiter is not None and category in SHARED_RATE_LIMIT_CATEGORIES:
+                limiter = shared_rate_limiter
+            retry_after = limiter.acquire((category, "ip", self.client_address[0]), *budgets["ip"])
+            session_id = self.parse_cookies().get("session_id")
+            if not retry_after and session_id in RequestHandler.sessions:  # Unknown cookies only count per IP
+                retry_after = limiter.acquire((category, "session", session_id), *budgets["session"])
+            if retry_after:
+                metrics.increment(f"rate_limited_{category}")
+                self.send_response(429)
+                self.send_header("Content-type", "text/html")
+                self.send_header("Retry-After", str(math.ceil(retry_after)))
+                self.end_headers()
+                self.wfile.write(b"<h1>429 Too Many Requests</h1><p>Please slow down and try again shortly.</p>")
+                return None
+        return handler_method(self)
+    return wrapper
+
+# --- Helper Functions for Cross-Process State ---
+# Each worker process keeps its own copy of the data. A worker notices writes made
+# by another worker by comparing file stamps, and replays the session journal from
+# the offset it last read. The journal only exists in pre-fork mode and is cleared
+# at startup, so, as with a single process, sessions do not outlive the server.
+
+SESSION_COMPACT_BYTES = 1 << 20  # Journal size past which it is rewritten to hold only live sessions
+SESSION_ENTRY_BYTES = 64  # Rough size of one journal line, to avoid compacting a journal of live sessions
+
+# POST routes that read, modify and save a data file. Only these take the shared
+# write lock; logins and logouts just append to the session journal.
+WRITE_POST_PATHS = frozenset({
+    "/signup",
+    "/admin/movies/add", "/admin/movies/edit", "/admin/movies/delete",
+    "/admin/movies/bulk_delete", "/admin/movies/bulk_feature",
+    "/admin/genres/add", "/admin/genres/edit", "/admin/genres/delete",
+    "/admin/users/toggle_admin", "/admin/users/toggle_suspension", "/admin/users/reset_password",
+    "/admin/settings/update", "/admin/profiling/start", "/admin/profiling/stop",
+})
+
+_file_stamps = {}  # {filepath: (inode, mtime_ns, size)} as of our last load/save
+_session_offset = 0  # Bytes of SESSION_FILE already applied to RequestHandler.sessions
+_session_inode = None  # Inode of the SESSION_FILE that offset refers to; compaction writes a new one
+_prefork = False  # True when running as one of several worker processes
+_write_lock = threading.RLock()  # Serializes writes between request threads of this process
+_refresh_lock = threading.Lock()  # Keeps request threads from reloading or replaying sessions at once
+_reload_thread = None  # The background thread reloading files for readers, if one is running
+_publish_lock = threading.Lock()  # Makes building and swapping in a new AppState atomic
+_session_lock = threading.Lock()  # Serializes session journal appends and compaction within this process
+
+def file_stamp(filepath):
+    """Return a stamp that changes whenever the file is rewritten, or None if missing."""
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+def remember_file_stamp(filepath):
+    """Record the current stamp of a file we are about to read or have just written."""
+    _file_stamps[filepath] = file_stamp(filepath)
+
+def file_changed(filepath):
+    """Check whether a file was never loaded, or was rewritten since we last loaded or saved it."""
+    return filepath not in _file_stamps or _file_stamps[filepath] != file_stamp(filepath)
+
+@contextmanager
+def atomic_write(filepath, mode="w"):
+    """Write a file via a temporary file and rename, so readers never see a partial file."""
+    tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"  # Unique per writing thread
+    try:
+        with open(tmp_path, mode, encoding=None if "b" in mode else "utf-8") as f:
+            yield f
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    remember_file_stamp(filepath)
+
+@contextmanager
+def file_lock(filepath, exclusive=True):
+    """Hold an flock on filepath, shared between worker processes (pre-fork mode is POSIX-only)."""
+    import fcntl
+    with open(filepath, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+@contextmanager
+def shared_write_lock():
+    """Serialize read-modify-write cycles between request threads and worker processes."""
+    with _write_lock:
+        if not _prefork:
+            yield
+            return
+        with file_lock(LOCK_FILE):
+            yield
+
+@contextmanager
+def session_journal_lock(exclusive=False):
+    """Hold the session journal in place: shared by workers appending to it, exclusive to compact it."""
+    with _session_lock:
+        with file_lock(SESSION_LOCK_FILE, exclusive):
+            yield
+
+def refresh_shared_state(wait=True):
+    """
+    Catch up with other workers: apply new session journal entries, and publish a
+    new state for any loaded collection whose file another worker has rewritten
+    since we read it (collections not yet loaded are read fresh on first use).
+
+    Writers pass wait=True and get the reloaded state. Readers pass wait=False:
+    they never wait on a refresh in progress, and leave reloading a changed file
+    to a background thread while they carry on with the current state.
+    """
+    global _reload_thread
+    if not _refresh_lock.acquire(blocking=wait):
+        return
+    try:
+        sync_sessions()
+        if _prefork:
+            sync_profiling_control()
+        if wait:
+            reload_changed_files()
+        elif changed_collections() and (
+                _reload_thread is None or not _reload_thread.is_alive()):
+            _reload_thread = threading.Thread(target=reload_in_background, daemon=True)
+            _reload_thread.start()
+    finally:
+        _refresh_lock.release()
+
+def changed_collections():
+    """Names of the collections the current state has loaded whose files were rewritten since."""
+    state = current_state()
+    return [name for name, (filepath, _) in DATA_FILES.items()
+            if state.loaded(name) is not _NOT_LOADED and file_changed(filepath)]
+
+def reload_changed_files(build_indexes=False):
+    """Reload every changed collection and publish them (call with _refresh_lock held)."""
+    state = current_state()
+    changes = {name: load_data(name) for name in changed_collections()}
+    if build_indexes and "movies" in changes and state.loaded("release_index") is not _NOT_LOADED:
+        changes["release_index"] = ReleaseDateIndex.build(changes["movies"])  # Readers keep the old one meanwhile
+    if changes:
+        publish_state(**changes)
+
+def reload_in_background():
+    """Reload changed files for readers, who keep serving the previous state until it is published."""
+    with _refresh_lock:  # Writers refreshing meanwhile wait for us rather than loading the same files
+        reload_changed_files(build_indexes=True)
+
+def sync_sessions():
+    """Apply session journal entries written since our last sync (by any worker)."""
+    global _session_offset, _session_inode
+    stamp = file_stamp(SESSION_FILE)
+    if stamp is None or (stamp[0] == _session_inode and stamp[2] == _session_offset):
+        return
+    try:
+        f = open(SESSION_FILE, "rb")
+    except OSError:
+        return
+    with f:
+        st = os.fstat(f.fileno())  # The file we actually opened, should it have been replaced since the stat
+        compacted = st.st_ino != _session_inode or st.st_size < _session_offset
+        if compacted:  # Rewritten as a new file; replay it from the start
+            sessions, offset = {}, 0
+        else:
+            sessions, offset = RequestHandler.sessions, _session_offset
+        f.seek(offset)
+        data = f.read(st.st_size - offset)
+    complete = data.rfind(b"\n") + 1  # Leave a half-written last line for the next sync
+    for line in data[:complete].decode("utf-8").splitlines():
+        session_id, _, username = line.partition(",")
+        if username:
+            sessions[session_id] = username
+        else:  # An empty username marks a logout
+            sessions.pop(session_id, None)
+    if compacted:
+        RequestHandler.sessions = sessions  # Swapped in whole, so requests never see a half-replayed journal
+    _session_offset = offset + complete
+    _session_inode = st.st_ino
+
+def append_session_entry(session_id, username=""):
+    """Append a login (or, with no username, a logout) to the session journal."""
+    if not _prefork:
+        return  # A single process has nobody to share its sessions with
+    with session_journal_lock():
+        with open(SESSION_FILE, "a", encoding="utf-8") as f:
+            f.write(f"{session_id},{username}\n")
+            size = f.tell()
+    if journal_needs_compaction(size):
+        compact_sessions()
+
+def journal_needs_compaction(size):
+    """Whether a journal of this size is mostly logouts and replayed-over logins."""
+    return size > max(SESSION_COMPACT_BYTES, 2 * SESSION_ENTRY_BYTES * len(RequestHandler.sessions))
+
+def compact_sessions():
+    """Rewrite the session journal so it only holds live sessions."""
+    global _session_offset, _session_inode
+    with session_journal_lock(exclusive=True), _refresh_lock:
+        stamp = file_stamp(SESSION_FILE)
+        if stamp is None or not journal_needs_compaction(stamp[2]):
+            return  # Another worker compacted it while we waited for the lock
+        sync_sessions()
+        with atomic_write(SESSION_FILE) as f:
+            # A copy, as request threads log in and out while we write
+            for session_id, username in list(RequestHandler.sessions.items()):
+                f.write(f"{session_id},{username}\n")
+        _session_inode, _, _session_offset = _file_stamps[SESSION_FILE]
+
 # --- Helper Functions for Data Persistence ---
 
 def hash_password(password):
     """Hash the password using SHA-256."""
     return hashlib.sha256(password.encode()).hexdigest()
 
+@timed_persistence(USER_FILE)
 def load_users():
     """
     Load users from the file into a dictionary.
@@ -37,6 +965,7 @@ def load_users():
     }
     """
     users = {}
+    remember_file_stamp(USER_FILE)
     if os.path.exists(USER_FILE):
         with open(USER_FILE, "r", encoding="utf-8") as file:
             for line in file:
@@ -58,18 +987,22 @@ def load_users():
                     }
     return users
 
-def save_users():
+@timed_persistence(USER_FILE)
+def save_users(users):
     """Save users from the dictionary back to the file."""
-    with open(USER_FILE, "w", encoding="utf-8") as file:
+    with atomic_write(USER_FILE) as file:
         for username, data in users.items():
             admin_status = "admin" if data["is_admin"] else "user"
             suspension_status = "suspended" if data["is_suspended"] else "active"
             email = data.get("email", "")  #
             phone = data.get("phone", "")  #
             file.write(f"{username},{data['password_hash']},{admin_status},{suspension_status},{email},{phone}\n")  #
+    write_snapshot(USER_FILE, users)
 
+@timed_persistence()
 def load_json_data(filepath):
     """Loads JSON data from a given file path."""
+    remember_file_stamp(filepath)
     if os.path.exists(filepath) and os.path.getsize(filepath) > 0:
         try:
             with open(filepath, "r", encoding="utf-8") as f:
@@ -79,14 +1012,25 @@ def load_json_data(filepath):
             return {} if "movies" in filepath or "genres" in filepath or "people" in filepath else []
     return {} # Return an empty dictionary for movies, genres, people
 
+@timed_persistence()
 def save_json_data(data, filepath): # Flipped arguments for consistency
     """Saves JSON data to a given file path."""
-    with open(filepath, "w", encoding="utf-8") as f:
+    with atomic_write(filepath) as f:
         json.dump(data, f, indent=4)
+    write_snapshot(filepath, data)
+
+def load_collection(filepath):
+    """Loads an ID-keyed collection, converting the old list format to a dictionary."""
+    data = load_json_data(filepath)
+    if not isinstance(data, dict): # Convert list to dict if old format
+        data = {item.get("id", str(uuid.uuid4())): item for item in data}
+    return data
 
 # --- Helper Functions for Application Settings ---
+@timed_persistence(SETTINGS_FILE)
 def load_settings():
     """Loads settings from the settings.json file."""
+    remember_file_stamp(SETTINGS_FILE)
     if os.path.exists(SETTINGS_FILE) and os.path.getsize(SETTINGS_FILE) > 0:
         try:
             with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
@@ -107,36 +1051,346 @@ def load_settings():
         "ANNOUNCEMENT_ACTIVE": False
     }
 
+@timed_persistence(SETTINGS_FILE)
 def save_settings(settings_data):
     """Saves settings to the settings.json file."""
-    with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
+    with atomic_write(SETTINGS_FILE) as f:
         json.dump(settings_data, f, indent=4)
+    write_snapshot(SETTINGS_FILE, settings_data)
+
+# --- Helper Functions for Binary Snapshots and Lazy Loading ---
+# Parsing users.txt and the JSON files dominates startup on large data sets, so a
+# marshal snapshot of each file is kept next to it, tagged with the stamp of the
+# file it was built from. It is loaded instead of the file only while that stamp
+# still matches, so editing the file by hand simply makes the snapshot stale.
+
+use_snapshots = True  # Set to False (or run with --no-snapshots) to always parse the source files
+
+@timed_persistence()
+def read_snapshot(filepath, stamp):
+    """Return the snapshot of filepath if it was built from this exact file version, else None."""
+    try:
+        with open(filepath + SNAPSHOT_SUFFIX, "rb") as f:
+            snapshot_format, source_stamp, data = marshal.loads(f.read())  # Much faster than marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if snapshot_format != SNAPSHOT_FORMAT or source_stamp != stamp:
+        return None
+    return data
+
+_pending_snapshots = {}  # {filepath: (stamp, data)} waiting for the snapshot writer thread
+_snapshot_lock = threading.Lock()  # Guards _pending_snapshots and _snapshot_writer
+_snapshot_writer = None  # The thread writing _pending_snapshots, if one is running
+
+def write_snapshot(filepath, data):
+    """
+    Queue a snapshot of data, tagged with the stamp filepath had when we last loaded
+    or saved it, for a background thread to write. Saves and loads return without
+    waiting for it; a newer version of the same file replaces one not yet written.
+    """
+    global _snapshot_writer
+    stamp = _file_stamps.get(filepath)
+    if not use_snapshots or stamp is None:
+        return
+    with _snapshot_lock:
+        _pending_snapshots[filepath] = (stamp, data)  # data is never modified once published
+        if _snapshot_writer is None or not _snapshot_writer.is_alive():  # A forked worker inherits no threads
+            _snapshot_writer = threading.Thread(target=write_pending_snapshots, daemon=True)
+            _snapshot_writer.start()
+
+def write_pending_snapshots():
+    """Write queued snapshots until none are left."""
+    while True:
+        with _snapshot_lock:
+            if not _pending_snapshots:
+                return
+            filepath, (stamp, data) = _pending_snapshots.popitem()
+        save_snapshot(filepath, stamp, data)
+
+def flush_snapshots():
+    """Write any queued snapshots now, e.g. before forking workers or shutting down."""
+    writer = _snapshot_writer
+    write_pending_snapshots()
+    if writer is not None:
+        writer.join()  # It may still be writing the last one it took
+
+@timed_persistence()
+def save_snapshot(filepath, stamp, data):
+    """Write the snapshot of filepath for the file version with this stamp."""
+    try:
+        with atomic_write(filepath + SNAPSHOT_SUFFIX, "wb") as f:
+            marshal.dump((SNAPSHOT_FORMAT, stamp, data), f)
+    except (OSError, ValueError) as e:
+        print(f"Warning: could not write snapshot for {filepath}: {e}")
+
+@contextmanager
+def gc_paused():
+    """Pause the cyclic garbage collector, which otherwise rescans every record built during a big load."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+def load_with_snapshot(filepath, loader):
+    """Load a data file through its snapshot when fresh, otherwise parse it and refresh the snapshot."""
+    stamp = file_stamp(filepath)
+    with gc_paused():
+        if use_snapshots and stamp is not None:
+            data = read_snapshot(filepath, stamp)
+            if data is not None:
+                _file_stamps[filepath] = stamp
+                return data
+        data = loader()
+    write_snapshot(filepath, data)
+    return data
+
+# Application data, by AppState field: (source file, loader). None of it is read at
+# import time; AppState loads each collection the first time a request uses it.
+DATA_FILES = {
+    "users": (USER_FILE, load_users),
+    "movies": (MOVIE_FILE, lambda: load_collection(MOVIE_FILE)),
+    "genres": (GENRE_FILE, lambda: load_collection(GENRE_FILE)),
+    "people": (PEOPLE_FILE, lambda: load_collection(PEOPLE_FILE)),  # For future use
+    "settings": (SETTINGS_FILE, load_settings),
+}
+
+def load_data(name):
+    """Load one data collection by its AppState field name."""
+    filepath, loader = DATA_FILES[name]
+    return load_with_snapshot(filepath, loader)
+
+# --- Application State ---
+# All application data lives in one immutable AppState. Writers never modify it:
+# they copy the dictionaries (and records) they change, persist them, and swap in
+# a new AppState with publish_state(). A request works with the state that was
+# current when it started, so readers never wait on, or observe half of, a write.
+
+RELEASE_DATE_MAX_KEY = "\U0010ffff"  # Sorts after every movie ID, for inclusive range ends
+_NOT_LOADED = object()  # Marks a collection or index that has not been loaded or built yet
+
+def release_index_entry(movie_id, movie):
+    """The (release_date, movie_id) index entry for a movie, or None if it has no YYYY-MM-DD date."""
+    release_date = movie.get("release_date")
+    # A cheap shape check (called for every movie when the index is built); only
+    # YYYY-MM-DD sorts correctly as a string
+    if (type(release_date) is not str or len(release_date) != 10 or release_date[4] != "-"
+            or release_date[7] != "-" or not release_date[:4].isdigit()):
+        return None
+    return (release_date, movie_id)
+
+class ReleaseDateIndex:
+    """Movies sorted by release date, with per-year counts. Never modified once built."""
+    __slots__ = ("entries", "year_counts")
+
+    def __init__(self, entries, year_counts):
+        self.entries = entries  # Sorted list of (release_date, movie_id)
+        self.year_counts = year_counts  # {year string: number of movies}
+
+    @classmethod
+    def build(cls, movies):
+        entries = sorted(filter(None, (release_index_entry(m_id, m) for m_id, m in movies.items())))
+        return cls(entries, dict(Counter(release_date[:4] for release_date, _ in entries)))
+
+    def updated(self, removed=(), added=()):
+        """Return a new index without the removed entries and with the added ones (None is ignored)."""
+        removed = [entry for entry in removed if entry]
+        added = [entry for entry in added if entry]
+        year_counts = dict(self.year_counts)
+        for release_date, _ in removed:
+            year_counts[release_date[:4]] -= 1
+            if not year_counts[release_date[:4]]:
+                del year_counts[release_date[:4]]
+        for release_date, _ in added:
+            year_counts[release_date[:4]] = year_counts.get(release_date[:4], 0) + 1
+
+        if len(removed) + len(added) > 64:  # Many changes: one filter-and-sort beats per-entry inserts
+            removed_set = set(removed)
+            entries = sorted([entry for entry in self.entries if entry not in removed_set] + added)
+            return ReleaseDateIndex(entries, year_counts)
+        entries = list(self.entries)
+        for entry in removed:
+            position = bisect.bisect_left(entries, entry)
+            if position < len(entries) and entries[position] == entry:
+                del entries[position]
+        for entry in added:
+            bisect.insort(entries, entry)
+        return ReleaseDateIndex(entries, year_counts)
+
+    def movie_ids_between(self, start=None, end=None, limit=None):
+        """IDs of movies released from start to end (inclusive ISO dates, either may be None), by date."""
+        low = bisect.bisect_left(self.entries, (start,)) if start else 0
+        high = bisect.bisect_right(self.entries, (end, RELEASE_DATE_MAX_KEY)) if end else len(self.entries)
+        if limit is not None:
+            high = min(high, low + limit)
+        return [movie_id for _, movie_id in self.entries[low:high]]
+
+class AppState:
+    """
+    One immutable version of users, movies, genres, people and settings, plus derived
+    indexes. Each collection is loaded, and the release index built, the first time
+    a request uses it, so a request never waits on data it does not read.
+    """
+    __slots__ = tuple(DATA_FILES) + ("release_index",)
+
+    def __init__(self, **values):
+        for name, value in values.items():
+            if value is not _NOT_LOADED:
+                object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("AppState is immutable; use publish_state() to swap in a new one")
 
-# Load data at startup
-users = load_users()
-# Ensure managed_movies, managed_genres, managed_people are dictionaries for ID-based access
-managed_movies = load_json_data(MOVIE_FILE)
-if not isinstance(managed_movies, dict): # Convert list to dict if old format
-    managed_movies = {movie.get("id", str(uuid.uuid4())): movie for movie in managed_movies}
+    def __getattr__(self, name):
+        """Load a collection or build the release index on first use (only called while it is not set)."""
+        if name not in _load_locks:
+            raise AttributeError(f"'AppState' object has no attribute {name!r}")
+        with _load_locks[name]:
+            value = self.loaded(name)
+            if value is _NOT_LOADED:  # Not loaded by another thread while we waited
+                value = ReleaseDateIndex.build(self.movies) if name == "release_index" else load_data(name)
+                object.__setattr__(self, name, value)
+            current = _state
+            if current is not self and current.loaded(name) is _NOT_LOADED and (
+                    name != "release_index" or current.loaded("movies") is self.movies):
+                object.__setattr__(current, name, value)  # Spares the current state loading it again
+        return value
 
-managed_genres = load_json_data(GENRE_FILE)
-if not isinstance(managed_genres, dict): # Convert list to dict if old format
-    managed_genres = {genre.get("id", str(uuid.uuid4())): genre for genre in managed_genres}
+    def loaded(self, name):
+        """The named attribute if it has been set, else _NOT_LOADED; never builds anything."""
+        try:
+            return object.__getattribute__(self, name)
+        except AttributeError:
+            return _NOT_LOADED
+
+    def updated_release_index(self, removed=(), added=()):
+        """The release index with some entries replaced, or _NOT_LOADED if it was never built."""
+        index = self.loaded("release_index")
+        return index if index is _NOT_LOADED else index.updated(removed, added)
+
+    def replace(self, **changes):
+        """
+        Return a new state with some collections replaced. Writers that change movies
+        should pass updated_release_index(); otherwise the index is rebuilt on next use.
+        """
+        if "release_index" not in changes:
+            changes["release_index"] = _NOT_LOADED if "movies" in changes else self.loaded("release_index")
+        return AppState(**{name: changes.get(name, self.loaded(name)) for name in AppState.__slots__})
+
+# Keeps request threads from loading the same collection, or building the same index, at once
+_load_locks = {name: threading.Lock() for name in AppState.__slots__}
+_state = None  # The current AppState, or None until a request first needs one
+
+def current_state():
+    """Return the current AppState; creating the first one reads no data."""
+    if _state is None:
+        publish_state()
+    return _state
+
+def publish_state(**changes):
+    """Atomically make a new state, with the given collections replaced, the current one."""
+    global _state
+    with _publish_lock:
+        if _state is None:
+            _state = AppState(**changes)
+        elif changes:
+            _state = _state.replace(**changes)
+
+# Module attributes kept for tools that read the data, e.g. login_server.users
+STATE_ATTRIBUTES = {"users": "users", "managed_movies": "movies", "managed_genres": "genres",
+                    "managed_people": "people", "settings": "settings"}
+
+def __getattr__(name):
+    """Expose the current state's collections as module attributes, loading them on first use."""
+    if name not in STATE_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(current_state(), STATE_ATTRIBUTES[name])
+
+def init_app(preload=False):
+    """Prepare the working directory for serving; optionally load all data up front."""
+    if not os.path.exists(AVATAR_DIR):
+        os.makedirs(AVATAR_DIR)
+    for stale_file in (SESSION_FILE, PROFILE_CONTROL_FILE):
+        if os.path.exists(stale_file):
+            os.remove(stale_file)  # Sessions and profiling runs from a previous run are not carried over
+    if os.path.isdir(METRICS_DIR):
+        for filename in os.listdir(METRICS_DIR):
+            os.remove(os.path.join(METRICS_DIR, filename))  # Workers of a previous run
+    if preload:  # Loaded before workers fork, so they share it instead of each loading it
+        state = current_state()
+        for name in AppState.__slots__:
+            getattr(state, name)
+        flush_snapshots()  # A forked worker would not inherit the snapshot writer thread
+
+# --- Helper Functions for Bulk Uploads ---
 
-managed_people = load_json_data(PEOPLE_FILE)  # For future use
-if not isinstance(managed_people, dict): # Convert list to dict if old format
-    managed_people = {person.get("id", str(uuid.uuid4())): person for person in managed_people}
+TRUE_VALUES = ("true", "1", "yes")
+FALSE_VALUES = ("false", "0", "no", "")
 
-settings = load_settings()  # Load application settings at startup
+def parse_flag(value):
+    """Parse a true/1/yes or false/0/no (or empty) flag, case-insensitively; None if it is neither."""
+    value = value.strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    return None
 
-# Create avatar directory if it doesn't exist
-if not os.path.exists(AVATAR_DIR):
-    os.makedirs(AVATAR_DIR)
+def is_valid_utf8(text):
+    """Whether text decoded with errors="surrogateescape" came from valid UTF-8 (no escaped bytes)."""
+    try:
+        text.encode("utf-8")
+    except UnicodeEncodeError:
+        return False
+    return True
 
 # --- Request Handler Class ---
 
 class RequestHandler(BaseHTTPRequestHandler):
     sessions = {}  # Dictionary to store active sessions: {session_id: username}
+    static_cache = {}  # {filename: (file_stamp, content_bytes)} for files served by respond_with_file
+    timeout = REQUEST_TIMEOUT  # Drops idle and stalled connections
+
+    def setup(self):
+        super().setup()
+        self.wfile = CountingWriter(self.wfile)  # Counts response bytes for metrics
+
+    def send_response(self, code, message=None):
+        self.response_status = code
+        super().send_response(code, message)
+
+    def handle_one_request(self):
+        self.admitted = False
+        try:
+            super().handle_one_request()
+        finally:
+            if self.admitted:
+                self.server.request_finished()
+
+    def parse_request(self):
+        """Parse the request line and headers, then shed the request if the server is overloaded."""
+        if not super().parse_request():
+            return False
+        if not self.server.admit_request():
+            self.respond_overloaded()
+            return False
+        self.admitted = True
+        return True
+
+    def respond_overloaded(self):
+        """Send an immediate 503 and close the connection."""
+        metrics.increment("overload_shed")
+        body = b"503 Service Unavailable: server is overloaded, please retry shortly."
+        self.close_connection = True
+        self.send_response(503)
+        self.send_header("Content-type", "text/plain")
+        self.send_header("Retry-After", str(OVERLOAD_RETRY_AFTER))
+        self.send_header("Connection", "close")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
     # --- Utility Methods ---
     def parse_cookies(self):
@@ -155,7 +1409,7 @@ class RequestHandler(BaseHTTPRequestHandler):
         """Check if the current session is authenticated as an admin."""
         session_id = self.parse_cookies().get("session_id")
         username = RequestHandler.sessions.get(session_id)
-        return username and users.get(username, {}).get("is_admin", False)
+        return username and self.state.users.get(username, {}).get("is_admin", False)
 
     def get_current_username(self):
         """Get the username for the current session."""
@@ -173,24 +1427,23 @@ class RequestHandler(BaseHTTPRequestHandler):
         """Serve a static file."""
         try:
             # Added a check for file existence
-            if not os.path.exists(filename):
+            stamp = file_stamp(filename)
+            if stamp is None:
                 raise FileNotFoundError
-            
-            # Read in binary mode for images, text mode for others
-            mode = "rb" if content_type.startswith("image/") else "r"
-            
-            # Explicitly set encoding for text files to UTF-8
-            # For binary files, encoding should be None
-            file_encoding = "utf-8" if mode == "r" else None 
 
-            # Pass the encoding to the open() function
-            with open(filename, mode, encoding=file_encoding) as file: # THIS IS THE KEY CHANGE
-                content = file.read()
-                self.send_response(200)
-                self.send_header("Content-type", content_type)
-                self.end_headers()
-                # For text content, ensure it's encoded to UTF-8 bytes for sending
-                self.wfile.write(content if content_type.startswith("image/") else content.encode('utf-8'))
+            # Serve from the in-memory cache unless the file changed on disk
+            cached = RequestHandler.static_cache.get(filename)
+            metrics.cache_lookup("static_files", cached is not None and cached[0] == stamp)
+            if cached is None or cached[0] != stamp:
+                # Files are stored as UTF-8 (text) or raw bytes (images), so read both as bytes
+                with open(filename, "rb") as file:
+                    cached = (stamp, file.read())
+                RequestHandler.static_cache[filename] = cached
+
+            self.send_response(200)
+            self.send_header("Content-type", content_type)
+            self.end_headers()
+            self.wfile.write(cached[1])
         except FileNotFoundError:
             self.send_response(404)
             self.end_headers()
@@ -207,6 +1460,13 @@ class RequestHandler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(message.encode('utf-8'))
 
+    def respond_with_json(self, data, status=200):
+        """Send a JSON response to the client."""
+        self.send_response(status)
+        self.send_header("Content-type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps(data).encode('utf-8'))
+
     def handle_avatar_upload(self, username, file_data):
         """Handle avatar upload and save to disk."""
         if not username:
@@ -292,10 +1552,12 @@ class RequestHandler(BaseHTTPRequestHandler):
     # --- Authentication Handlers ---
     def handle_login(self, username, password):
         """Process the login request."""
+        users = self.state.users
         if username in users and not users[username]["is_suspended"]:
             if users[username]["password_hash"] == hash_password(password):
                 session_id = str(uuid.uuid4())
                 RequestHandler.sessions[session_id] = username
+                append_session_entry(session_id, username)
                 self.send_response(302)  # Redirect
                 self.send_header("Set-Cookie", f"session_id={session_id}; Path=/; HttpOnly")
                 self.send_header("Set-Cookie", f"username={username}; Path=/")  # For client-side display
@@ -311,7 +1573,8 @@ class RequestHandler(BaseHTTPRequestHandler):
 
     def handle_signup(self, fields):  # Modified to accept 'fields' dictionary
         """Process the signup request."""
-        if not settings['ALLOW_SIGNUP']:  # Check if signup is allowed
+        users = self.state.users
+        if not self.state.settings['ALLOW_SIGNUP']:  # Check if signup is allowed
             self.respond_with_message("<h1>New user registration is currently disabled by the administrator.</h1>", status=403)
             return
 
@@ -328,6 +1591,7 @@ class RequestHandler(BaseHTTPRequestHandler):
             self.respond_with_message("<h1>Username and password cannot be empty.</h1>", status=400)
             return
 
+        users = dict(users)
         users[username] = {
             "password_hash": hash_password(password),
             "is_admin": False,
@@ -335,13 +1599,15 @@ class RequestHandler(BaseHTTPRequestHandler):
             "email": email,  #
             "phone": phone  #
         }
-        save_users()
+        save_users(users)
+        publish_state(users=users)
         self.respond_with_message("<h1>Signup successful! You can now <a href=\"/login\">login</a>.</h1>", status=201)
 
     def handle_logout(self, session_id):
         """Process logout request."""
         if session_id in RequestHandler.sessions:
             del RequestHandler.sessions[session_id]
+            append_session_entry(session_id)
         self.send_response(302)  # Redirect
         self.send_header("Set-Cookie", "session_id=; expires=Thu, 01 Jan 1970 00:00:00 UTC; Path=/; HttpOnly")
         self.send_header("Set-Cookie", "username=; expires=Thu, 01 Jan 1970 00:00:00 UTC; Path=/;")
@@ -352,7 +1618,6 @@ class RequestHandler(BaseHTTPRequestHandler):
     # --- Admin Content Management Handlers ---
     def handle_add_movie(self, fields):
         """Handles adding a new movie."""
-        global managed_movies 
 
         title = fields.get("title", [""])[0]
         overview = fields.get("overview", [""])[0]
@@ -377,19 +1642,22 @@ class RequestHandler(BaseHTTPRequestHandler):
             "poster_path": poster_path,
             "is_featured": False # Default to not featured
         }
-        managed_movies[movie_id] = new_movie # Store as dict with ID as key
-        save_json_data(managed_movies, MOVIE_FILE)
+        movies = dict(self.state.movies)
+        movies[movie_id] = new_movie # Store as dict with ID as key
+        save_json_data(movies, MOVIE_FILE)
+        publish_state(movies=movies, release_index=self.state.updated_release_index(
+            added=[release_index_entry(movie_id, new_movie)]))
         self.respond_with_message(f"Movie '{title}' added successfully.")
 
     def handle_edit_movie(self, fields):
         """Handles editing an existing movie."""
-        global managed_movies
+        movies = self.state.movies
         movie_id = fields.get("id", [""])[0]
-        if not movie_id or movie_id not in managed_movies:
+        if not movie_id or movie_id not in movies:
             self.respond_with_message("Movie not found for editing.", status=404)
             return
 
-        movie = managed_movies[movie_id]
+        movie = dict(movies[movie_id])
         
         # Update fields if provided
         movie["title"] = fields.get("title", [movie["title"]])[0]
@@ -404,48 +1672,58 @@ class RequestHandler(BaseHTTPRequestHandler):
 
         # Handle is_featured checkbox (will be 'on' if checked, or missing if unchecked)
         movie["is_featured"] = "is_featured" in fields
-        
-        save_json_data(managed_movies, MOVIE_FILE)
+
+        release_index = self.state.updated_release_index(
+            removed=[release_index_entry(movie_id, movies[movie_id])], added=[release_index_entry(movie_id, movie)])
+        movies = dict(movies)
+        movies[movie_id] = movie
+        save_json_data(movies, MOVIE_FILE)
+        publish_state(movies=movies, release_index=release_index)
         self.respond_with_message(f"Movie '{movie['title']}' updated successfully!")
 
     def handle_delete_movie(self, fields):
         """Handles deleting a movie."""
-        global managed_movies
+        movies = self.state.movies
         movie_id = fields.get("id", [""])[0]
-        if not movie_id or movie_id not in managed_movies:
+        if not movie_id or movie_id not in movies:
             self.respond_with_message("Movie not found for deletion.", status=404)
             return
         
-        movie_title = managed_movies[movie_id]["title"] # Get title before deleting
-        del managed_movies[movie_id]
-        save_json_data(managed_movies, MOVIE_FILE)
+        movie_title = movies[movie_id]["title"] # Get title before deleting
+        release_index = self.state.updated_release_index(removed=[release_index_entry(movie_id, movies[movie_id])])
+        movies = dict(movies)
+        del movies[movie_id]
+        save_json_data(movies, MOVIE_FILE)
+        publish_state(movies=movies, release_index=release_index)
         self.respond_with_message(f"Movie '{movie_title}' deleted successfully!")
 
     def handle_add_genre(self, fields):
         """Handles adding a new genre."""
-        global managed_genres
+        genres = self.state.genres
         genre_name = fields.get("name", [""])[0].strip()
         if not genre_name:
             self.respond_with_message("Genre name is required.", status=400)
             return
         
         # Check for duplicate genre names (case-insensitive)
-        if any(g["name"].lower() == genre_name.lower() for g in managed_genres.values()):
+        if any(g["name"].lower() == genre_name.lower() for g in genres.values()):
             self.respond_with_message("Genre with this name already exists.", status=409)
             return
 
         genre_id = str(uuid.uuid4())
-        managed_genres[genre_id] = {"id": genre_id, "name": genre_name}
-        save_json_data(managed_genres, GENRE_FILE)
+        genres = dict(genres)
+        genres[genre_id] = {"id": genre_id, "name": genre_name}
+        save_json_data(genres, GENRE_FILE)
+        publish_state(genres=genres)
         self.respond_with_message(f"Genre '{genre_name}' added successfully.")
 
     def handle_edit_genre(self, fields):
         """Handles editing an existing genre."""
-        global managed_genres
+        genres = self.state.genres
         genre_id = fields.get("id", [""])[0]
         new_name = fields.get("name", [""])[0].strip()
 
-        if not genre_id or genre_id not in managed_genres:
+        if not genre_id or genre_id not in genres:
             self.respond_with_message("Genre not found for editing.", status=404)
             return
         if not new_name:
@@ -453,38 +1731,362 @@ class RequestHandler(BaseHTTPRequestHandler):
             return
         
         # Check for duplicate genre names (case-insensitive, excluding itself)
-        if any(g["name"].lower() == new_name.lower() for g_id, g in managed_genres.items() if g_id != genre_id):
+        if any(g["name"].lower() == new_name.lower() for g_id, g in genres.items() if g_id != genre_id):
             self.respond_with_message("Genre with this name already exists.", status=409)
             return
 
-        old_name = managed_genres[genre_id]["name"]
-        managed_genres[genre_id]["name"] = new_name
-        save_json_data(managed_genres, GENRE_FILE)
+        old_name = genres[genre_id]["name"]
+        genres = dict(genres)
+        genres[genre_id] = dict(genres[genre_id], name=new_name)
+        save_json_data(genres, GENRE_FILE)
+        publish_state(genres=genres)
         self.respond_with_message(f"Genre '{old_name}' updated to '{new_name}' successfully!")
 
     def handle_delete_genre(self, fields):
         """Handles deleting a genre."""
-        global managed_genres
-        global managed_movies # Need to update movies that use this genre
+        genres = self.state.genres
         genre_id = fields.get("id", [""])[0]
-        if not genre_id or genre_id not in managed_genres:
+        if not genre_id or genre_id not in genres:
             self.respond_with_message("Genre not found for deletion.", status=404)
             return
         
-        genre_name = managed_genres[genre_id]["name"] # Get name before deleting
-        del managed_genres[genre_id]
-        save_json_data(managed_genres, GENRE_FILE)
+        genre_name = genres[genre_id]["name"] # Get name before deleting
+        genres = dict(genres)
+        del genres[genre_id]
+        save_json_data(genres, GENRE_FILE)
 
         # Also remove this genre from any movies that might have it
-        for movie_id in managed_movies:
-            if 'genre_ids' in managed_movies[movie_id] and genre_id in managed_movies[movie_id]['genre_ids']:
-                managed_movies[movie_id]['genre_ids'].remove(genre_id)
-        save_json_data(managed_movies, MOVIE_FILE)
+        changed_movies = {
+            movie_id: dict(movie, genre_ids=[g_id for g_id in movie['genre_ids'] if g_id != genre_id])
+            for movie_id, movie in self.state.movies.items()
+            if genre_id in movie.get('genre_ids', ())
+        }
+        if changed_movies:
+            movies = dict(self.state.movies)
+            movies.update(changed_movies)
+            save_json_data(movies, MOVIE_FILE)
+            publish_state(genres=genres, movies=movies, release_index=self.state.loaded("release_index"))  # Dates unchanged
+        else:
+            publish_state(genres=genres)
 
         self.respond_with_message(f"Genre '{genre_name}' deleted successfully!")
 
+    # --- Bulk Catalog Handlers ---
+    # Bulk imports are validated in full before anything is applied: if any row is
+    # invalid the catalog is left untouched and every row error is reported. A
+    # successful batch is persisted with a single save. Uploads are read and
+    # validated before taking the write lock, so a slow upload holds up no other
+    # writer; rows are validated again if another write landed in the meantime.
+
+    def iter_request_lines(self):
+        """
+        Yield the request body line by line without reading it into memory at once.
+        Bytes that are not valid UTF-8 are kept as escapes, for rows to report.
+        """
+        remaining = int(self.headers.get("Content-Length") or 0)
+        while remaining > 0:
+            line = self.rfile.readline(remaining)
+            if not line:
+                break
+            remaining -= len(line)
+            yield line.decode("utf-8", "surrogateescape")
+
+    def iter_bulk_rows(self):
+        """Yield (row_number, row_dict_or_None, error_or_None) from an NDJSON or CSV upload."""
+        if self.headers.get("Content-Type", "").startswith("text/csv"):
+            reader = csv.DictReader(self.iter_request_lines())
+            while True:
+                try:
+                    row = next(reader)
+                except StopIteration:
+                    return
+                except csv.Error as e:  # The reader resumes at the next line
+                    yield reader.reader.line_num, None, f"Invalid CSV: {e}"  # DictReader's is not updated on errors
+                    continue
+                row = {key: value for key, value in row.items() if key}
+                if not all(is_valid_utf8(text) for text in [*row, *row.values()] if isinstance(text, str)):
+                    yield reader.line_num, None, "Row is not valid UTF-8."
+                    continue
+                yield reader.line_num, row, None
+        for row_number, line in enumerate(self.iter_request_lines(), start=1):
+            if not line.strip():
+                continue
+            if not is_valid_utf8(line):
+                yield row_number, None, "Row is not valid UTF-8."
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row_number, None, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(row, dict):
+                yield row_number, None, "Each line must be a JSON object."
+                continue
+            yield row_number, row, None
+
+    def read_bulk_rows(self):
+        """Read an NDJSON or CSV upload into [(row_number, row_dict)], plus the errors of unreadable rows."""
+        rows, errors = [], []
+        for row_number, row, error in self.iter_bulk_rows():
+            if error is None:
+                rows.append((row_number, row))
+            else:
+                errors.append({"row": row_number, "error": error})
+        return rows, errors
+
+    def respond_with_bulk_result(self, applied, errors, **counts):
+        """Report the outcome of a bulk operation as JSON."""
+        result = {"applied": applied, **counts, "error_count": len(errors),
+                  "errors": errors[:BULK_MAX_REPORTED_ERRORS]}
+        self.respond_with_json(result, status=200 if applied else 400)
+
+    def parse_movie_row(self, row, existing):
+        """Validate one imported movie row; returns (movie, error)."""
+        existing = existing or {}
+
+        def field(name, default):
+            value = row.get(name)
+            return default if value is None else value  # Missing CSV cells and JSON nulls keep the current value
+
+        title = str(row.get("title") or "").strip()
+        if not title:
+            return None, "Movie title is required."
+        release_date = row.get("release_date")
+        if release_date is None:
+            release_date = existing.get("release_date", "")  # Kept as is, like the other omitted fields
+        elif str(release_date).strip():
+            try:
+                release_date = datetime.date.fromisoformat(str(release_date).strip()).isoformat()
+            except ValueError:
+                return None, f"Invalid release_date '{release_date}' (expected YYYY-MM-DD)."
+        else:
+            release_date = ""
+        genre_ids = field("genre_ids", existing.get("genre_ids", []))
+        if isinstance(genre_ids, str):
+            genre_ids = [g_id.strip() for g_id in genre_ids.split(',') if g_id.strip()]
+        if not isinstance(genre_ids, list) or not all(isinstance(g_id, str) for g_id in genre_ids):
+            return None, "genre_ids must be a list or a comma-separated string of genre IDs."
+        unknown = [g_id for g_id in genre_ids if g_id not in self.state.genres]
+        if unknown:
+            return None, f"Unknown genre IDs: {', '.join(unknown)}"
+        is_featured = field("is_featured", existing.get("is_featured", False))
+        if isinstance(is_featured, str):
+            if parse_flag(is_featured) is None:
+                return None, f"Invalid is_featured value '{is_featured}'."
+            is_featured = parse_flag(is_featured)
+        movie_id = str(row.get("id") or "").strip() or str(uuid.uuid4())
+        return {
+            "id": movie_id,
+            "title": title,
+            "overview": str(field("overview", existing.get("overview", ""))),
+            "release_date": release_date,
+            "genre_ids": genre_ids,
+            "poster_path": str(field("poster_path", existing.get("poster_path", ""))),
+            "is_featured": bool(is_featured),
+        }, None
+
+    def stage_movie_rows(self, rows):
+        """Validate movie rows against the current state; returns ({movie_id: movie}, errors)."""
+        movies = self.state.movies
+        staged, errors = {}, []
+        for row_number, row in rows:
+            movie, error = self.parse_movie_row(row, movies.get(str(row.get("id") or "").strip()))
+            if error is not None:
+                errors.append({"row": row_number, "error": error})
+            else:
+                staged[movie["id"]] = movie
+        return staged, errors
+
+    def handle_bulk_import_movies(self):
+        """Creates or updates (by "id") many movies from an NDJSON or CSV upload."""
+        rows, read_errors = self.read_bulk_rows()
+        staged, errors = self.stage_movie_rows(rows)
+        errors = sorted(read_errors + errors, key=lambda error: error["row"])
+        if errors or not staged:
+            self.respond_with_bulk_result(0, errors or [{"row": 0, "error": "No movies in upload."}])
+            return
+        with shared_write_lock():
+            if self.refresh_for_bulk_write():
+                staged, errors = self.stage_movie_rows(rows)
+                if errors:
+                    self.respond_with_bulk_result(0, errors)
+                    return
+            self.apply_bulk_movies(staged)
+
+    def refresh_for_bulk_write(self):
+        """
+        Under the write lock, switch to the latest state. Returns True if it changed
+        since the upload was validated, meaning its rows must be validated again.
+        """
+        refresh_shared_state()
+        state = current_state()
+        if state is self.state:
+            return False
+        self.state = state
+        return True
+
+    def apply_bulk_movies(self, staged):
+        """Save validated movies and publish them."""
+        movies = self.state.movies
+        updated = sum(1 for movie_id in staged if movie_id in movies)
+        release_index = self.state.updated_release_index(
+            removed=[release_index_entry(m_id, movies[m_id]) for m_id in staged if m_id in movies],
+            added=[release_index_entry(m_id, movie) for m_id, movie in staged.items()])
+        movies = dict(movies)
+        movies.update(staged)
+        save_json_data(movies, MOVIE_FILE)
+        publish_state(movies=movies, release_index=release_index)
+        self.respond_with_bulk_result(len(staged), [], created=len(staged) - updated, updated=updated)
+
+    def stage_genre_rows(self, rows):
+        """Validate genre rows against the current state; returns ({genre_id: genre}, errors)."""
+        genres = self.state.genres
+        staged, errors = {}, []
+        # Case-insensitive names that must stay unique: existing genres not renamed by this batch
+        names_in_use = {g["name"].lower(): g_id for g_id, g in genres.items()}
+        for row_number, row in rows:
+            genre_name = str(row.get("name") or "").strip()
+            genre_id = str(row.get("id") or "").strip() or str(uuid.uuid4())
+            owner = names_in_use.get(genre_name.lower())
+            if not genre_name:
+                errors.append({"row": row_number, "error": "Genre name is required."})
+                continue
+            if owner is not None and owner != genre_id:
+                errors.append({"row": row_number, "error": f"Genre with the name '{genre_name}' already exists."})
+                continue
+            if genre_id in genres:
+                names_in_use.pop(genres[genre_id]["name"].lower(), None)
+            names_in_use[genre_name.lower()] = genre_id
+            staged[genre_id] = {"id": genre_id, "name": genre_name}
+        return staged, errors
+
+    def handle_bulk_import_genres(self):
+        """Creates or renames (by "id") many genres from an NDJSON or CSV upload."""
+        rows, read_errors = self.read_bulk_rows()
+        staged, errors = self.stage_genre_rows(rows)
+        errors = sorted(read_errors + errors, key=lambda error: error["row"])
+        if errors or not staged:
+            self.respond_with_bulk_result(0, errors or [{"row": 0, "error": "No genres in upload."}])
+            return
+        with shared_write_lock():
+            if self.refresh_for_bulk_write():
+                staged, errors = self.stage_genre_rows(rows)
+                if errors:
+                    self.respond_with_bulk_result(0, errors)
+                    return
+            self.apply_bulk_genres(staged)
+
+    def apply_bulk_genres(self, staged):
+        """Save validated genres and publish them."""
+        genres = self.state.genres
+        updated = sum(1 for genre_id in staged if genre_id in genres)
+        genres = dict(genres)
+        genres.update(staged)
+        save_json_data(genres, GENRE_FILE)
+        publish_state(genres=genres)
+        self.respond_with_bulk_result(len(staged), [], created=len(staged) - updated, updated=updated)
+
+    def bulk_movie_ids(self, fields):
+        """Collect movie IDs from repeated "id" fields and/or a comma-separated "ids" field."""
+        movie_ids = [m_id.strip() for m_id in fields.get("id", []) if m_id.strip()]
+        for ids in fields.get("ids", []):
+            movie_ids.extend(m_id.strip() for m_id in ids.split(',') if m_id.strip())
+        errors = [{"id": m_id, "error": "Movie not found."} for m_id in movie_ids if m_id not in self.state.movies]
+        if not movie_ids:
+            errors.append({"id": "", "error": "No movie IDs given."})
+        return list(dict.fromkeys(movie_ids)), errors
+
+    def handle_bulk_delete_movies(self, fields):
+        """Handles deleting many movies at once."""
+        movie_ids, errors = self.bulk_movie_ids(fields)
+        if errors:
+            self.respond_with_bulk_result(0, errors)
+            return
+        movies = dict(self.state.movies)
+        release_index = self.state.updated_release_index(
+            removed=[release_index_entry(movie_id, movies[movie_id]) for movie_id in movie_ids])
+        for movie_id in movie_ids:
+            del movies[movie_id]
+        save_json_data(movies, MOVIE_FILE)
+        publish_state(movies=movies, release_index=release_index)
+        self.respond_with_bulk_result(len(movie_ids), [], deleted=len(movie_ids))
+
+    def handle_bulk_feature_movies(self, fields):
+        """Handles setting or clearing the featured flag on many movies at once."""
+        movie_ids, errors = self.bulk_movie_ids(fields)
+        value = fields.get("is_featured", ["true"])[0]
+        is_featured = parse_flag(value)
+        if is_featured is None:
+            errors.append({"field": "is_featured", "error": f"Invalid is_featured value '{value}'."})
+        if errors:
+            self.respond_with_bulk_result(0, errors)
+            return
+        movies = dict(self.state.movies)
+        for movie_id in movie_ids:
+            movies[movie_id] = dict(movies[movie_id], is_featured=is_featured)
+        save_json_data(movies, MOVIE_FILE)
+        publish_state(movies=movies, release_index=self.state.loaded("release_index"))  # Dates unchanged
+        self.respond_with_bulk_result(len(movie_ids), [], is_featured=is_featured)
+
+    def stream_ndjson(self, records, filename):
+        """Stream records as NDJSON, one JSON object per line, in batches."""
+        self.send_response(200)
+        self.send_header("Content-type", "application/x-ndjson")
+        self.send_header("Content-Disposition", f'attachment; filename="{filename}"')
+        self.end_headers()
+        for start in range(0, len(records), EXPORT_BATCH_SIZE):
+            batch = records[start:start + EXPORT_BATCH_SIZE]
+            self.wfile.write("".join(json.dumps(record) + "\n" for record in batch).encode('utf-8'))
+
+    # --- Release Calendar Handlers ---
+    def parse_date_param(self, query_params, name):
+        """Return a YYYY-MM-DD query parameter, None if absent; raises ValueError if malformed."""
+        value = query_params.get(name, [""])[0].strip()
+        if not value:
+            return None
+        return datetime.date.fromisoformat(value).isoformat()
+
+    def parse_limit_param(self, query_params, default=None):
+        """Return the "limit" query parameter as a positive int; raises ValueError if malformed."""
+        value = query_params.get("limit", [""])[0].strip()
+        if not value:
+            return default
+        limit = int(value)
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        return limit
+
+    def respond_with_movies_by_id(self, movie_ids):
+        """Send the given movies, in order, as a JSON list."""
+        movies = self.state.movies
+        self.respond_with_json([movies[movie_id] for movie_id in movie_ids])
+
+    def respond_with_release_range(self, query_params):
+        """Movies released between ?from= and ?to= (inclusive), ordered by release date."""
+        try:
+            start = self.parse_date_param(query_params, "from")
+            end = self.parse_date_param(query_params, "to")
+            limit = self.parse_limit_param(query_params)
+        except ValueError:
+            self.respond_with_message("Dates must be YYYY-MM-DD and limit a positive number.", status=400)
+            return
+        self.respond_with_movies_by_id(self.state.release_index.movie_ids_between(start, end, limit))
+
+    def respond_with_upcoming_movies(self, query_params):
+        """Movies released from today onward (optionally within ?days=), soonest first."""
+        try:
+            limit = self.parse_limit_param(query_params, default=UPCOMING_DEFAULT_LIMIT)
+            days = int(query_params.get("days", ["0"])[0] or 0)
+        except ValueError:
+            self.respond_with_message("limit and days must be numbers.", status=400)
+            return
+        today = datetime.date.today()
+        end = (today + datetime.timedelta(days=days)).isoformat() if days > 0 else None
+        self.respond_with_movies_by_id(self.state.release_index.movie_ids_between(today.isoformat(), end, limit))
+
     def generate_mock_data(self):
         """Generates mock analytics data based on existing user and movie data."""
+        state = self.state
         # Mock data for Users by Creation Month
         users_by_creation_month = {
             "January": 10, "February": 15, "March": 20, "April": 12, "May": 25,
@@ -493,19 +2095,19 @@ class RequestHandler(BaseHTTPRequestHandler):
         }
 
         # Mock data for Movies by Genre (based on actual genres if available)
-        movies_by_genre = {genre["name"]: 0 for genre in managed_genres.values()}
+        movies_by_genre = {genre["name"]: 0 for genre in state.genres.values()}
         if not movies_by_genre: # Fallback if no genres are loaded
             movies_by_genre = {"Action": 0, "Comedy": 0, "Drama": 0, "Science Fiction": 0}
 
-        for movie in managed_movies.values():
+        for movie in state.movies.values():
             for genre_id in movie.get("genre_ids", []):
-                genre_name = managed_genres.get(genre_id, {}).get("name")
+                genre_name = state.genres.get(genre_id, {}).get("name")
                 if genre_name:
                     movies_by_genre[genre_name] = movies_by_genre.get(genre_name, 0) + 1
 
         # Mock data for Top Movies by Feature (e.g., top 5 featured movies)
         top_movies_by_feature = []
-        featured_movies = [m for m in managed_movies.values() if m.get("is_featured")]
+        featured_movies = [m for m in state.movies.values() if m.get("is_featured")]
         # Sort by title for consistent mock data if not enough truly featured movies
         featured_movies_sorted = sorted(featured_movies, key=lambda x: x["title"])[:5] 
         for movie in featured_movies_sorted:
@@ -515,8 +2117,8 @@ class RequestHandler(BaseHTTPRequestHandler):
             })
 
         # Mock data for Active vs Suspended Users
-        active_users = sum(1 for user_data in users.values() if not user_data["is_suspended"])
-        suspended_users = sum(1 for user_data in users.values() if user_data["is_suspended"])
+        active_users = sum(1 for user_data in state.users.values() if not user_data["is_suspended"])
+        suspended_users = sum(1 for user_data in state.users.values() if user_data["is_suspended"])
         active_vs_suspended_users = {
             "active": active_users,
             "suspended": suspended_users
@@ -530,8 +2132,13 @@ class RequestHandler(BaseHTTPRequestHandler):
         }
 
     # --- HTTP Method Handlers ---
+    @instrumented
+    @rate_limited
+    @profiled
     def do_GET(self):
         """Handle GET requests."""
+        refresh_shared_state(wait=False)  # Readers never queue behind a reload
+        self.state = current_state()  # This request reads one consistent version throughout
         parsed_path = urlparse(self.path)
         path = parsed_path.path
         query_params = parse_qs(parsed_path.query)
@@ -572,20 +2179,28 @@ class RequestHandler(BaseHTTPRequestHandler):
                 self.respond_with_file(path[1:], "image/x-icon")
         # --- API Endpoints ---
         elif path == "/api/movies":
+            if "from" in query_params or "to" in query_params:
+                self.respond_with_release_range(query_params)
+                return
             self.send_response(200)
             self.send_header("Content-type", "application/json")
             self.end_headers()
-            self.wfile.write(json.dumps(list(managed_movies.values())).encode('utf-8'))
+            self.wfile.write(json.dumps(list(self.state.movies.values())).encode('utf-8'))
+        elif path == "/api/movies/upcoming":
+            self.respond_with_upcoming_movies(query_params)
+        elif path == "/api/movies/years":
+            year_counts = self.state.release_index.year_counts
+            self.respond_with_json({year: year_counts[year] for year in sorted(year_counts)})
         elif path == "/api/genres":
             self.send_response(200)
             self.send_header("Content-type", "application/json")
             self.end_headers()
-            self.wfile.write(json.dumps(list(managed_genres.values())).encode('utf-8'))
+            self.wfile.write(json.dumps(list(self.state.genres.values())).encode('utf-8'))
         elif path == "/api/settings":
             self.send_response(200)
             self.send_header("Content-type", "application/json")
             self.end_headers()
-            self.wfile.write(json.dumps(settings).encode('utf-8'))
+            self.wfile.write(json.dumps(self.state.settings).encode('utf-8'))
         elif path == "/api/user/avatar":
             username = self.get_current_username()
             if not username:
@@ -618,7 +2233,7 @@ class RequestHandler(BaseHTTPRequestHandler):
                 suspension_filter = query_params.get("suspension", ["all"])[0].lower()  #
 
                 filtered_users = []  #
-                for username, data in users.items():  #
+                for username, data in self.state.users.items():  #
                     if search_query and search_query not in username.lower():  #
                         continue  #
                     if role_filter != 'all' and ((role_filter == 'admin' and not data['is_admin']) or \
@@ -645,16 +2260,26 @@ class RequestHandler(BaseHTTPRequestHandler):
         elif path == "/admin/movies":
             if is_admin:
                 # Return movies as a list of their dicts for easier consumption by frontend
-                movies_list = list(managed_movies.values())
+                movies_list = list(self.state.movies.values())
                 self.send_response(200)
                 self.send_header("Content-type", "application/json")
                 self.end_headers()
                 self.wfile.write(json.dumps(movies_list).encode('utf-8'))
             else:
                 self.forbidden_admin_response()
+        elif path == "/admin/movies/export":
+            if is_admin:
+                self.stream_ndjson(list(self.state.movies.values()), "movies.ndjson")
+            else:
+                self.forbidden_admin_response()
+        elif path == "/admin/genres/export":
+            if is_admin:
+                self.stream_ndjson(list(self.state.genres.values()), "genres.ndjson")
+            else:
+                self.forbidden_admin_response()
         elif path == "/admin/genres":
             if is_admin:
-                genres_list = list(managed_genres.values())
+                genres_list = list(self.state.genres.values())
                 self.send_response(200)
                 self.send_header("Content-type", "application/json")
                 self.end_headers()
@@ -662,6 +2287,54 @@ class RequestHandler(BaseHTTPRequestHandler):
             else:
                 self.forbidden_admin_response()
         
+        elif path == "/admin/metrics":
+            if is_admin:
+                report = merged_metrics()
+                if query_params.get("format", ["json"])[0] == "prometheus":
+                    body = report.to_prometheus().encode('utf-8')
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                else:
+                    body = json.dumps(report.to_dict()).encode('utf-8')
+                    content_type = "application/json"
+                self.send_response(200)
+                self.send_header("Content-type", content_type)
+                self.end_headers()
+                self.wfile.write(body)
+            else:
+                self.forbidden_admin_response()
+
+        elif path == "/admin/profiling":
+            if is_admin:
+                self.send_response(200)
+                self.send_header("Content-type", "application/json")
+                self.end_headers()
+                self.wfile.write(json.dumps(profile_results().status()).encode('utf-8'))
+            else:
+                self.forbidden_admin_response()
+        elif path == "/admin/profiling/download":
+            if is_admin:
+                output_format = query_params.get("format", ["collapsed"])[0]
+                results = profile_results()
+                if output_format == "pstats":
+                    body = results.pstats_dump()
+                    if body is None:
+                        self.respond_with_message("No profile data collected.", status=404)
+                        return
+                    content_type, filename = "application/octet-stream", "profile.pstats"
+                elif output_format == "text":
+                    body = results.pstats_text().encode('utf-8')
+                    content_type, filename = "text/plain; charset=utf-8", "profile.txt"
+                else:
+                    body = results.collapsed_stacks().encode('utf-8')
+                    content_type, filename = "text/plain; charset=utf-8", "profile.collapsed"
+                self.send_response(200)
+                self.send_header("Content-type", content_type)
+                self.send_header("Content-Disposition", f'attachment; filename="{filename}"')
+                self.end_headers()
+                self.wfile.write(body)
+            else:
+                self.forbidden_admin_response()
+
         # --- New Analytics Endpoints ---
         elif path == "/admin/analytics/users_by_creation_month":
             if is_admin:
@@ -706,12 +2379,28 @@ class RequestHandler(BaseHTTPRequestHandler):
             self.end_headers()
             self.wfile.write(b"404 Not Found")
 
+    @instrumented
+    @rate_limited
+    @profiled
     def do_POST(self):
         """Handle POST requests."""
         parsed_path = urlparse(self.path)
         path = parsed_path.path
         
         content_type = self.headers.get('Content-Type', '')
+
+        if path in BULK_IMPORT_PATHS:
+            # Bulk uploads are parsed row by row straight from the request stream; the
+            # handlers take the write lock themselves once the upload has been read
+            refresh_shared_state()
+            self.state = current_state()
+            if not self.is_authenticated_admin():
+                self.forbidden_admin_response()
+            elif path == "/admin/movies/bulk_import":
+                self.handle_bulk_import_movies()
+            else:
+                self.handle_bulk_import_genres()
+            return
         
         if content_type.startswith('multipart/form-data'):
             # Handle file upload
@@ -726,6 +2415,18 @@ class RequestHandler(BaseHTTPRequestHandler):
             post_data = self.rfile.read(content_length)
             form_data = parse_qs(post_data.decode('utf-8'), keep_blank_values=True)
 
+        if path not in WRITE_POST_PATHS:
+            refresh_shared_state()
+            self.state = current_state()
+            self.route_post(path, form_data)
+            return
+        with shared_write_lock():
+            refresh_shared_state()
+            self.state = current_state()
+            self.route_post(path, form_data)
+
+    def route_post(self, path, form_data):
+        """Dispatch a parsed POST request to its handler."""
         session_id = self.parse_cookies().get("session_id")
         is_admin = self.is_authenticated_admin()
 
@@ -776,6 +2477,16 @@ class RequestHandler(BaseHTTPRequestHandler):
                 self.handle_delete_movie(form_data)
             else:
                 self.forbidden_admin_response()
+        elif path == "/admin/movies/bulk_delete":
+            if is_admin:
+                self.handle_bulk_delete_movies(form_data)
+            else:
+                self.forbidden_admin_response()
+        elif path == "/admin/movies/bulk_feature":
+            if is_admin:
+                self.handle_bulk_feature_movies(form_data)
+            else:
+                self.forbidden_admin_response()
         elif path == "/admin/genres/add":
             if is_admin:
                 self.handle_add_genre(form_data)
@@ -796,9 +2507,12 @@ class RequestHandler(BaseHTTPRequestHandler):
                 username_to_toggle = form_data.get("username", [""])[0]
                 make_admin = form_data.get("make_admin", ["false"])[0].lower() == "true"
                 
+                users = self.state.users
                 if username_to_toggle in users:
-                    users[username_to_toggle]["is_admin"] = make_admin
-                    save_users()
+                    users = dict(users)
+                    users[username_to_toggle] = dict(users[username_to_toggle], is_admin=make_admin)
+                    save_users(users)
+                    publish_state(users=users)
                     self.respond_with_message(f"Admin status for {username_to_toggle} set to {make_admin}")
                 else:
                     self.respond_with_message("User not found", status=404)
@@ -807,9 +2521,13 @@ class RequestHandler(BaseHTTPRequestHandler):
         elif path == "/admin/users/toggle_suspension":
             if is_admin:
                 username_to_toggle = form_data.get("username", [""])[0]
+                users = self.state.users
                 if username_to_toggle in users:
-                    users[username_to_toggle]["is_suspended"] = not users[username_to_toggle]["is_suspended"]
-                    save_users()
+                    users = dict(users)
+                    user = users[username_to_toggle]
+                    users[username_to_toggle] = dict(user, is_suspended=not user["is_suspended"])
+                    save_users(users)
+                    publish_state(users=users)
                     self.respond_with_message(f"Suspension status for user '{username_to_toggle}' toggled successfully.")
                 else:
                     self.respond_with_message("User not found.", status=404)
@@ -819,10 +2537,13 @@ class RequestHandler(BaseHTTPRequestHandler):
             if is_admin:
                 username = form_data.get("username", [""])[0]
                 new_password = form_data.get("new_password", [""])[0]
+                users = self.state.users
                 if username in users:
                     if new_password:
-                        users[username]["password_hash"] = hash_password(new_password)
-                        save_users()
+                        users = dict(users)
+                        users[username] = dict(users[username], password_hash=hash_password(new_password))
+                        save_users(users)
+                        publish_state(users=users)
                         self.respond_with_message(f"Password for user '{username}' reset successfully.")
                     else:
                         self.respond_with_message("New password cannot be empty.", status=400)
@@ -834,8 +2555,8 @@ class RequestHandler(BaseHTTPRequestHandler):
         # Application Settings Update
         elif path == "/admin/settings/update":
             if self.is_authenticated_admin():
-                global settings
                 try:
+                    settings = dict(self.state.settings)
                     # Note: 'fields' is not directly available here in do_POST, use 'form_data'
                     settings['TMDB_API_KEY'] = form_data.get("TMDB_API_KEY", [settings.get('TMDB_API_KEY', '')])[0]
                     settings['ALLOW_SIGNUP'] = form_data.get("ALLOW_SIGNUP", ['false'])[0].lower() == 'true'
@@ -843,22 +2564,151 @@ class RequestHandler(BaseHTTPRequestHandler):
                     settings['ANNOUNCEMENT_ACTIVE'] = form_data.get("ANNOUNCEMENT_ACTIVE", ['false'])[0].lower() == 'true'
 
                     save_settings(settings)
+                    publish_state(settings=settings)
                     self.respond_with_message("Application settings updated successfully.")
                 except Exception as e:
                     self.respond_with_message(f"Error updating settings: {str(e)}", status=500)
             else:
                 self.forbidden_admin_response()
+        # Profiling Control
+        elif path == "/admin/profiling/start":
+            if is_admin:
+                try:
+                    sample_rate = float(form_data.get("sample_rate", ["0.1"])[0])
+                    duration = float(form_data.get("duration", ["60"])[0])
+                except ValueError:
+                    self.respond_with_message("Sample rate and duration must be numbers.", status=400)
+                    return
+                route = form_data.get("route", [""])[0].strip() or None
+                if not 0 < sample_rate <= 1 and not route:
+                    self.respond_with_message("Sample rate must be between 0 and 1.", status=400)
+                    return
+                if not 0 < duration <= PROFILE_MAX_DURATION:
+                    self.respond_with_message(f"Duration must be between 1 and {PROFILE_MAX_DURATION} seconds.", status=400)
+                    return
+                profiler.start(sample_rate, route, time.time() + duration)
+                if _prefork:
+                    publish_profiling_control(sample_rate, route, profiler.ends_at, profiler.run_id)
+                target = f"all requests to {route}" if route else f"{sample_rate:.0%} of requests"
+                self.respond_with_message(f"Profiling {target} for {duration:g} seconds.")
+            else:
+                self.forbidden_admin_response()
+        elif path == "/admin/profiling/stop":
+            if is_admin:
+                profiler.stop()
+                control = read_profiling_control() if _prefork else None
+                if control is not None:
+                    publish_profiling_control(control["sample_rate"], control["route"], control["ends_at"],
+                                              control["run_id"], active=False)
+                self.respond_with_message("Profiling stopped.")
+            else:
+                self.forbidden_admin_response()
         else:
             self.send_response(404)
             self.end_headers()
             self.wfile.write(b"404 Not Found")
 
 # --- Start Server ---
-def run():
-    server_address = ("", 8080)
-    httpd = HTTPServer(server_address, RequestHandler)
-    print(f"Starting server on http://localhost:{8080}")
-    httpd.serve_forever()
+class AdmissionControlledHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server whose handlers shed requests with a fast 503 beyond MAX_IN_FLIGHT."""
+    daemon_threads = True
+
+    def __init__(self, server_address, handler_class, max_in_flight=MAX_IN_FLIGHT):
+        super().__init__(server_address, handler_class)
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.in_flight_lock = threading.Lock()
+
+    def admit_request(self):
+        """Count a parsed request as in flight, unless MAX_IN_FLIGHT already are; returns whether it was."""
+        with self.in_flight_lock:
+            if self.in_flight >= self.max_in_flight:
+                return False
+            self.in_flight += 1
+            return True
+
+    def request_finished(self):
+        with self.in_flight_lock:
+            self.in_flight -= 1
+
+class ReusePortHTTPServer(AdmissionControlledHTTPServer):
+    """Server that lets several worker processes bind the same port."""
+    def server_bind(self):
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+def make_server(port=8080, host="", handler_class=RequestHandler):
+    """Create (but do not start) a single-process server. Port 0 picks a free port."""
+    return AdmissionControlledHTTPServer((host, port), handler_class)
+
+def serve_worker(port):
+    """Serve requests in a pre-forked worker until interrupted."""
+    global _prefork
+    _prefork = True
+    signal.signal(signal.SIGTERM, _interrupt)  # Sent by the parent to stop us; finish cleanly
+    threading.Thread(target=flush_worker_metrics, daemon=True).start()
+    httpd = ReusePortHTTPServer(("", port), RequestHandler)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        flush_snapshots()
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+def run(port=8080, workers=1):
+    global shared_rate_limiter
+    # Workers are forked after loading so they share the parsed data instead of each parsing it
+    init_app(preload=workers > 1)
+    if workers > 1 and not (hasattr(os, "fork") and hasattr(socket, "SO_REUSEPORT")):
+        print("Warning: multiple workers need fork() and SO_REUSEPORT; running a single process.")
+        workers = 1
+
+    if workers <= 1:
+        httpd = make_server(port)
+        print(f"Starting server on http://localhost:{httpd.server_port}")
+        try:
+            httpd.serve_forever()
+        finally:
+            flush_snapshots()
+        return
+
+    print(f"Starting server on http://localhost:{port} with {workers} worker processes")
+    shared_rate_limiter = SharedTokenBucketLimiter()
+    worker_pids = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                serve_worker(port)
+            finally:
+                os._exit(0)
+        worker_pids.append(pid)
+
+    signal.signal(signal.SIGTERM, _interrupt)  # Stopping the parent stops every worker
+    try:
+        for pid in worker_pids:
+            os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        for pid in worker_pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in worker_pids:
+            os.waitpid(pid, 0)
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Run the movie site server.")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=1, help="Number of pre-forked worker processes")
+    parser.add_argument("--no-snapshots", action="store_true", help="Always parse the data files instead of using binary snapshots")
+    parser.add_argument("--no-rate-limits", action="store_true", help="Disable per-client rate limiting")
+    args = parser.parse_args()
+    use_snapshots = not args.no_snapshots
+    rate_limits_enabled = not args.no_rate_limits
+    run(port=args.port, workers=args.workers)
\ No newline at end of file